@@ -7,7 +7,9 @@ if (!fs.existsSync(publicDataDir)) {
     fs.mkdirSync(publicDataDir, { recursive: true });
 }
 
-// Copy all JSON files from data/analysis to public/data
+// Link all JSON files from data/analysis into public/data. The analysis files
+// aren't modified by the build, so a hard link avoids copying their bytes;
+// fall back to a copy when linking isn't possible (e.g. across devices).
 const sourceDir = path.join(__dirname, '..', '..', 'data', 'analysis');
 const files = fs.readdirSync(sourceDir);
 
@@ -15,7 +17,13 @@ files.forEach(file => {
     if (file.endsWith('.json')) {
         const sourcePath = path.join(sourceDir, file);
         const destPath = path.join(publicDataDir, file);
-        fs.copyFileSync(sourcePath, destPath);
-        console.log(`Copied ${file} to public/data/`);
+        fs.rmSync(destPath, { force: true });
+        try {
+            fs.linkSync(sourcePath, destPath);
+            console.log(`Linked ${file} into public/data/`);
+        } catch (error) {
+            fs.copyFileSync(sourcePath, destPath);
+            console.log(`Copied ${file} to public/data/`);
+        }
     }
 }); 
\ No newline at end of file
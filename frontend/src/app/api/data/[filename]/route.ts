@@ -1,6 +1,21 @@
 import { NextResponse } from 'next/server';
 import path from 'path';
 import fs from 'fs/promises';
+import { gzipSync } from 'zlib';
+
+// The data/analysis directory relative to the frontend directory, resolved once
+const analysisDir = path.join(process.cwd(), '..', 'data', 'analysis');
+
+// How long browsers may reuse an analysis file before revalidating it; the
+// files only change when the analyses are re-run
+const maxAgeSeconds = 3600;
+
+// File contents by path, raw and gzipped, reused until the file's
+// modification time changes
+const fileCache = new Map<
+    string,
+    { mtimeMs: number; contents: Buffer; gzipped: Buffer }
+>();
 
 export async function GET(
     request: Request,
@@ -8,12 +23,12 @@ export async function GET(
 ) {
     try {
         const { filename } = context.params;
-        // Read from the data/analysis directory relative to the frontend directory
-        const filePath = path.join(process.cwd(), '..', 'data', 'analysis', filename);
+        const filePath = path.join(analysisDir, filename);
 
         // Check if file exists
+        let stats;
         try {
-            await fs.access(filePath);
+            stats = await fs.stat(filePath);
         } catch (error) {
             console.error(`File not found: ${filePath}`);
             return NextResponse.json(
@@ -22,9 +37,64 @@ export async function GET(
             );
         }
 
-        const fileContents = await fs.readFile(filePath, 'utf8');
-        const data = JSON.parse(fileContents);
-        return NextResponse.json(data);
+        // Tag the file's version by its size and modification time. The tag is
+        // weak since the same version is sent raw or gzipped.
+        const etag = `W/"${stats.size.toString(16)}-${Math.floor(stats.mtimeMs).toString(16)}"`;
+        const cacheHeaders = {
+            'Cache-Control': `public, max-age=${maxAgeSeconds}`,
+            ETag: etag,
+            'Last-Modified': stats.mtime.toUTCString(),
+        };
+
+        // The client already has this version. If-None-Match takes precedence;
+        // If-Modified-Since is only checked for clients without the tag, at the
+        // one-second resolution of HTTP dates.
+        const ifNoneMatch = request.headers.get('if-none-match');
+        const ifModifiedSince = request.headers.get('if-modified-since');
+        const notModified = ifNoneMatch
+            ? ifNoneMatch.split(',').some(tag => tag.trim() === etag)
+            : ifModifiedSince !== null &&
+              Math.floor(stats.mtimeMs / 1000) * 1000 <= Date.parse(ifModifiedSince);
+        if (notModified) {
+            return new NextResponse(null, { status: 304, headers: cacheHeaders });
+        }
+
+        // Reuse the contents read earlier unless the file has changed since
+        let cached = fileCache.get(filePath);
+        if (!cached || cached.mtimeMs !== stats.mtimeMs) {
+            // Compress once per version of the file rather than per request
+            const contents = await fs.readFile(filePath);
+            cached = {
+                mtimeMs: stats.mtimeMs,
+                contents,
+                gzipped: gzipSync(contents, { level: 6 }),
+            };
+            fileCache.set(filePath, cached);
+        }
+
+        // The analysis files are already JSON, so serve them as-is rather than
+        // parsing and re-serializing them on every request, gzipped when the
+        // client accepts it
+        const acceptsGzip = /\bgzip\b/.test(
+            request.headers.get('accept-encoding') || ''
+        );
+        if (acceptsGzip) {
+            return new NextResponse(cached.gzipped, {
+                headers: {
+                    ...cacheHeaders,
+                    'Content-Type': 'application/json',
+                    'Content-Encoding': 'gzip',
+                    Vary: 'Accept-Encoding',
+                },
+            });
+        }
+        return new NextResponse(cached.contents, {
+            headers: {
+                ...cacheHeaders,
+                'Content-Type': 'application/json',
+                Vary: 'Accept-Encoding',
+            },
+        });
     } catch (error) {
         console.error('Error serving data:', error);
         return NextResponse.json(
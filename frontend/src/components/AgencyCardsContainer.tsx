@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect, type ChangeEvent } from 'react';
+import React, { useState, useEffect, useMemo, type ChangeEvent } from 'react';
 import { Agency, WordCountData, CorrectionsByAgencyData, DEIFootprintData, BureaucracyData, Correction } from '@/types/data';
 import { fetchWordCountData, fetchCorrectionsData, fetchDEIFootprintData, fetchBureaucracyData, fetchAgencyHierarchyData } from '@/utils/data';
 import AgencyCard from './AgencyCard';
@@ -50,20 +50,21 @@ export default function AgencyCardsContainer() {
                     throw new Error('Invalid agency hierarchy data received');
                 }
 
-                console.log('Agency hierarchy data:', hierarchy);
-                console.log('Agriculture department:', hierarchy.agencies.find(a => a.slug === 'agriculture-department'));
-
                 setWordCountData(wordCount);
                 setCorrectionsData(corrections);
                 setDeiData(dei);
                 setBureaucracyData(bureaucracy);
                 setAgencies(hierarchy.agencies);
 
+                // Index the agencies by slug once instead of searching the list
+                // for every agency with corrections
+                const agencyBySlug = new Map(hierarchy.agencies.map(a => [a.slug, a]));
+
                 // Extract all corrections with their agency information
                 const allCorrections: CorrectionWithAgency[] = Object.entries(corrections.agencies || {})
                     .flatMap(([agencySlug, agencyData]) => {
                         // Find the agency name from the hierarchy
-                        const agency = hierarchy.agencies.find(a => a.slug === agencySlug);
+                        const agency = agencyBySlug.get(agencySlug);
                         // Use the proper name from the hierarchy, or fallback to a formatted version of the slug
                         const agencyName = agency?.name || agencySlug
                             .split('-')
@@ -80,13 +81,18 @@ export default function AgencyCardsContainer() {
                     .sort((a, b) => b.year - a.year);
 
                 // Take the 10 most recent corrections, ensuring no duplicate IDs
-                const uniqueCorrections = allCorrections.reduce((acc, correction) => {
+                const seenIds = new Set<string>();
+                const uniqueCorrections: CorrectionWithAgency[] = [];
+                for (const correction of allCorrections) {
+                    if (uniqueCorrections.length === 10) {
+                        break;
+                    }
                     // If we haven't seen this ID yet, add it
-                    if (!acc.some(c => c.id === correction.id)) {
-                        acc.push(correction);
+                    if (!seenIds.has(correction.id)) {
+                        seenIds.add(correction.id);
+                        uniqueCorrections.push(correction);
                     }
-                    return acc;
-                }, [] as CorrectionWithAgency[]).slice(0, 10);
+                }
 
                 setRecentCorrections(uniqueCorrections);
             } catch (err) {
@@ -110,7 +116,35 @@ export default function AgencyCardsContainer() {
         }
     };
 
-    const getSortedAgencies = () => {
+    // Lowercased agency names, computed once per agency list rather than for
+    // every agency on every keystroke
+    const lowerNames = useMemo(
+        () => new Map(agencies.map(agency => [agency.slug, agency.name.toLowerCase()])),
+        [agencies]
+    );
+
+    // Sort only when the agencies, their data or the sort order change, so
+    // typing a search query just filters the already sorted list
+    const sortedAgencies = useMemo(() => {
+        const getSortValue = (agency: Agency, field: SortField): number | string => {
+            switch (field) {
+                case 'name':
+                    return agency.name;
+                case 'wordCount':
+                    return wordCountData?.agencies[agency.slug]?.total || 0;
+                case 'corrections':
+                    return correctionsData?.agencies[agency.slug]?.total || 0;
+                case 'deiMentions':
+                    return deiData?.agencies[agency.slug]?.total || 0;
+                case 'bureaucraticScore':
+                    const wordCount = wordCountData?.agencies[agency.slug]?.total || 0;
+                    const bureaucracyMentions = bureaucracyData?.agencies[agency.slug]?.total || 0;
+                    return wordCount > 0 ? (bureaucracyMentions / wordCount) * 1000 : 0;
+                default:
+                    return 0;
+            }
+        };
+
         return [...agencies].sort((a, b) => {
             const aValue = getSortValue(a, sortField);
             const bValue = getSortValue(b, sortField);
@@ -121,29 +155,11 @@ export default function AgencyCardsContainer() {
                 return aValue < bValue ? 1 : -1;
             }
         });
-    };
-
-    const getSortValue = (agency: Agency, field: SortField): number | string => {
-        switch (field) {
-            case 'name':
-                return agency.name;
-            case 'wordCount':
-                return wordCountData?.agencies[agency.slug]?.total || 0;
-            case 'corrections':
-                return correctionsData?.agencies[agency.slug]?.total || 0;
-            case 'deiMentions':
-                return deiData?.agencies[agency.slug]?.total || 0;
-            case 'bureaucraticScore':
-                const wordCount = wordCountData?.agencies[agency.slug]?.total || 0;
-                const bureaucracyMentions = bureaucracyData?.agencies[agency.slug]?.total || 0;
-                return wordCount > 0 ? (bureaucracyMentions / wordCount) * 1000 : 0;
-            default:
-                return 0;
-        }
-    };
+    }, [agencies, sortField, sortDirection, wordCountData, correctionsData, deiData, bureaucracyData]);
 
-    const filteredAgencies = getSortedAgencies().filter(agency =>
-        agency.name.toLowerCase().includes(searchQuery.toLowerCase())
+    const lowerQuery = searchQuery.toLowerCase();
+    const filteredAgencies = sortedAgencies.filter(agency =>
+        (lowerNames.get(agency.slug) ?? '').includes(lowerQuery)
     );
 
     const handleShowMore = () => {
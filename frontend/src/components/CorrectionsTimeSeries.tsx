@@ -1,5 +1,6 @@
 'use client';
 
+import { useMemo } from 'react';
 import { Agency, CorrectionsData } from '@/types/data';
 import { Line } from 'react-chartjs-2';
 import {
@@ -29,56 +30,47 @@ interface CorrectionsTimeSeriesProps {
 }
 
 export default function CorrectionsTimeSeries({ agency, correctionsData }: CorrectionsTimeSeriesProps) {
-    const getYearlyData = () => {
-        if (!correctionsData?.agencies) return { labels: [], data: [] };
-
-        const yearData: { [key: number]: number } = {};
-        const years = new Set<number>();
-
-        // Collect all years from references
-        Object.values(correctionsData.agencies).forEach(agencyData => {
+    // Corrections per year across all agencies, counted in a single pass over
+    // the data; its years are the chart's labels for every agency
+    const totalsByYear = useMemo(() => {
+        const counts = new Map<number, number>();
+        Object.values(correctionsData?.agencies || {}).forEach(agencyData => {
             if (!agencyData?.references) return;
             Object.values(agencyData.references).forEach(ref => {
                 if (!ref?.corrections) return;
                 ref.corrections.forEach(correction => {
-                    years.add(correction.year);
+                    counts.set(correction.year, (counts.get(correction.year) || 0) + 1);
                 });
             });
         });
+        return counts;
+    }, [correctionsData]);
 
-        const sortedYears = Array.from(years).sort((a, b) => a - b);
+    const { labels, data } = useMemo(() => {
+        if (!correctionsData?.agencies) return { labels: [], data: [] };
 
+        const sortedYears = Array.from(totalsByYear.keys()).sort((a, b) => a - b);
+
+        let yearData = totalsByYear;
         if (agency) {
             // For specific agency, count corrections by year
+            yearData = new Map<number, number>();
             const agencyData = correctionsData.agencies[agency.slug];
             if (agencyData?.references) {
                 Object.values(agencyData.references).forEach(ref => {
                     if (!ref?.corrections) return;
                     ref.corrections.forEach(correction => {
-                        yearData[correction.year] = (yearData[correction.year] || 0) + 1;
+                        yearData.set(correction.year, (yearData.get(correction.year) || 0) + 1);
                     });
                 });
             }
-        } else {
-            // For all agencies, count total corrections by year
-            Object.values(correctionsData.agencies).forEach(agencyData => {
-                if (!agencyData?.references) return;
-                Object.values(agencyData.references).forEach(ref => {
-                    if (!ref?.corrections) return;
-                    ref.corrections.forEach(correction => {
-                        yearData[correction.year] = (yearData[correction.year] || 0) + 1;
-                    });
-                });
-            });
         }
 
         return {
             labels: sortedYears.map(year => year.toString()),
-            data: sortedYears.map(year => yearData[year] || 0)
+            data: sortedYears.map(year => yearData.get(year) || 0)
         };
-    };
-
-    const { labels, data } = getYearlyData();
+    }, [agency, correctionsData, totalsByYear]);
 
     const chartData = {
         labels,
@@ -31,28 +31,32 @@ export default function HistoricCorrectionsList({ correctionsData, hierarchyData
         direction: 'desc'
     });
 
-    const findAgency = (agencies: Agency[], slug: string): Agency | null => {
-        for (const agency of agencies) {
-            if (agency.slug === slug) return agency;
-            if (agency.children) {
-                const found = findAgency(agency.children, slug);
-                if (found) return found;
+    // Agency names by slug, indexed once rather than searching the hierarchy
+    // for every agency of every row
+    const agencyNames = useMemo(() => {
+        const names = new Map<string, string>();
+        const addAgencies = (agencies: Agency[]) => {
+            for (const agency of agencies) {
+                // Keep the first agency found for a slug, parents before children
+                if (!names.has(agency.slug)) {
+                    names.set(agency.slug, agency.name);
+                }
+                if (agency.children) {
+                    addAgencies(agency.children);
+                }
             }
-        }
-        return null;
-    };
+        };
+        addAgencies(hierarchyData?.agencies || []);
+        return names;
+    }, [hierarchyData]);
 
-    const getAgencyName = (slug: string) => {
-        if (!hierarchyData) return slug;
-        const agency = findAgency(hierarchyData.agencies, slug);
-        return agency ? agency.name : slug;
-    };
+    const getAgencyName = (slug: string) => agencyNames.get(slug) ?? slug;
 
     const corrections = useMemo(() => {
         if (!correctionsData?.agencies) return [];
 
         const allCorrections: ProcessedCorrection[] = [];
-        const seenIds = new Set<string>();
+        const correctionsById = new Map<string, ProcessedCorrection>();
 
         Object.entries(correctionsData.agencies).forEach(([agencySlug, agencyData]) => {
             if (!agencyData?.references) return;
@@ -61,9 +65,9 @@ export default function HistoricCorrectionsList({ correctionsData, hierarchyData
                 if (!refData?.corrections) return;
 
                 refData.corrections.forEach(correction => {
-                    if (!seenIds.has(correction.id)) {
-                        seenIds.add(correction.id);
-                        allCorrections.push({
+                    const existingCorrection = correctionsById.get(correction.id);
+                    if (!existingCorrection) {
+                        const processedCorrection = {
                             id: correction.id,
                             year: correction.year,
                             title: parseInt(correction.hierarchy.title),
@@ -71,13 +75,12 @@ export default function HistoricCorrectionsList({ correctionsData, hierarchyData
                             text: correction.corrective_action,
                             cfrRef: correction.cfr_reference || '',
                             tupleKey
-                        });
-                    } else {
+                        };
+                        correctionsById.set(correction.id, processedCorrection);
+                        allCorrections.push(processedCorrection);
+                    } else if (!existingCorrection.agencies.includes(agencySlug)) {
                         // Add agency to existing correction's agencies array
-                        const existingCorrection = allCorrections.find(c => c.id === correction.id);
-                        if (existingCorrection && !existingCorrection.agencies.includes(agencySlug)) {
-                            existingCorrection.agencies.push(agencySlug);
-                        }
+                        existingCorrection.agencies.push(agencySlug);
                     }
                 });
             });
@@ -17,14 +17,12 @@ export default function OverviewCard() {
                 setLoading(true);
                 setError(null);
 
-                console.log('Starting to load overview data...');
                 const [wordCount, corrections, hierarchy] = await Promise.all([
                     fetchWordCountData(),
                     fetchCorrectionsData(),
                     fetchAgencyHierarchyData()
                 ]);
 
-                console.log('Data loaded successfully');
                 setWordCountData(wordCount);
                 setCorrectionsData(corrections);
                 setHierarchyData(hierarchy);
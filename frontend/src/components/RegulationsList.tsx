@@ -1,5 +1,6 @@
 'use client';
 
+import { useMemo } from 'react';
 import { Agency, WordCountData } from '@/types/data';
 
 interface RegulationsListProps {
@@ -8,7 +9,8 @@ interface RegulationsListProps {
 }
 
 export default function RegulationsList({ agency, wordCountData }: RegulationsListProps) {
-    const getReferences = () => {
+    // Only rebuild the sorted list when the agency or the data change
+    const references = useMemo(() => {
         if (!wordCountData || !agency) return [];
 
         const agencyData = wordCountData.agencies[agency.slug];
@@ -26,9 +28,7 @@ export default function RegulationsList({ agency, wordCountData }: RegulationsLi
                 };
             })
             .sort((a, b) => a.title - b.title);
-    };
-
-    const references = getReferences();
+    }, [agency, wordCountData]);
 
     return (
         <div className="mt-8">
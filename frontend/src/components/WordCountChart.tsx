@@ -32,7 +32,8 @@ interface WordCountChartProps {
 }
 
 export default function WordCountChart({ agency, wordCountData }: WordCountChartProps) {
-    const getTitleWordCounts = () => {
+    // Only re-walk the references when the agency or the data change
+    const { labels, data, indices } = React.useMemo(() => {
         if (!wordCountData) return { labels: [], data: [], indices: [] };
 
         // Initialize counts for all 50 titles
@@ -79,9 +80,7 @@ export default function WordCountChart({ agency, wordCountData }: WordCountChart
             data: nonZeroData.map(item => item.count),
             indices: nonZeroData.map(item => item.index)
         };
-    };
-
-    const { labels, data, indices } = getTitleWordCounts();
+    }, [agency, wordCountData]);
 
     const chartData: ChartData<'bar'> = {
         labels,
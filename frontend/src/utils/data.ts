@@ -2,9 +2,23 @@ import { WordCountData, DEIFootprintData, CorrectionsData, BureaucracyData, Agen
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || '';
 
-export async function fetchAnalysisData<T>(filename: string): Promise<T> {
+// Requests by filename, so components on the same page showing the same
+// analysis share one download and parse of its file
+const analysisDataRequests = new Map<string, Promise<unknown>>();
+
+export function fetchAnalysisData<T>(filename: string): Promise<T> {
+    let request = analysisDataRequests.get(filename);
+    if (!request) {
+        request = loadAnalysisData<T>(filename);
+        // Forget failed requests so a retry fetches the file again
+        request.catch(() => analysisDataRequests.delete(filename));
+        analysisDataRequests.set(filename, request);
+    }
+    return request as Promise<T>;
+}
+
+async function loadAnalysisData<T>(filename: string): Promise<T> {
     try {
-        console.log(`Fetching data from: ${API_BASE_URL}/api/data/${filename}`);
         const response = await fetch(`${API_BASE_URL}/api/data/${filename}`);
 
         if (!response.ok) {
@@ -2,17 +2,23 @@
 Base analyzer for eCFR data, providing shared functionality for different analyses.
 """
 
-import json
+import bisect
 import logging
+import os
+import string
 import time
 from pathlib import Path
 from typing import Dict, List
 from collections import defaultdict
-import copy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-from bs4 import BeautifulSoup
+import orjson
+import zstandard
+from lxml import etree
 from tqdm import tqdm
 
+from ecfr_analyzer.process_data.json_utils import dump_json, load_json
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,117 +30,307 @@ logger = logging.getLogger(__name__)
 ANALYSIS_DIR = Path("data") / "analysis"
 ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
 
+# CFR hierarchy levels below the title, in nesting order:
+# (DIV tag, reference key, description label)
+REFERENCE_LEVELS = [
+    ("DIV2", "subtitle", "Subtitle"),
+    ("DIV3", "chapter", "Chapter"),
+    ("DIV4", "subchapter", "Subchapter"),
+    ("DIV5", "part", "Part"),
+    ("DIV6", "subpart", "Subpart"),
+    ("DIV7", "subjgrp", "Subject Group"),
+    ("DIV8", "section", "Section"),
+]
+
+# DIV tags of the title and every hierarchy level below it
+DIV_TAGS = ("DIV1",) + tuple(div_tag for div_tag, _, _ in REFERENCE_LEVELS)
+
+# Lowercases ASCII letters only, like translate() in the XPath it replaces
+ASCII_LOWER_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Parser for title XML, created once. ID collection, entity resolution and
+# network access are all unneeded for eCFR titles and only slow parsing.
+TITLE_XML_PARSER = etree.XMLParser(
+    recover=True,
+    huge_tree=True,
+    collect_ids=False,
+    resolve_entities=False,
+    no_network=True,
+)
+
+
+# Version of the extracted text cache format, bumped when the stored text changes
+# (2: text is stored lowercased)
+TEXT_CACHE_VERSION = 2
+
+# Smallest batch, in characters, worth sending to worker processes for word
+# counting or keyword scanning. Both run at roughly 50-70 MB/s per core,
+# against about 10 ms to start a process pool and 1 ms/MB to send texts to
+# it, so smaller batches are processed in-process
+POOL_MIN_CHARS = 8_000_000
+
+# Analysis results are written compact, as they can be several MB and are
+# only read by the frontend; set PRETTY_ANALYSIS_JSON=1 to indent them
+PRETTY_ANALYSIS_JSON = os.getenv("PRETTY_ANALYSIS_JSON", "").lower() in ("1", "true")
+
+
+# Analyzer used by extraction worker processes, set up by _init_extraction_worker
+_worker_analyzer = None
+
+
+def _init_extraction_worker():
+    """Create the analyzer each extraction worker process reuses."""
+    global _worker_analyzer
+    _worker_analyzer = BaseECFRAnalyzer()
+
+
+def _extract_title_references(title_number, refs):
+    """Load and parse a title, then extract the text of its references.
+
+    Runs in a worker process (see BaseECFRAnalyzer._extract_title_texts).
+
+    Args:
+        title_number: The CFR title number
+        refs: CFR reference dictionaries of this title to extract
+
+    Returns:
+        Dictionary mapping ref_key to (text, description), or None if the
+        title couldn't be loaded
+    """
+    title_start_time = time.perf_counter()
+
+    xml_data = _worker_analyzer._load_title_data(title_number)
+    root = _worker_analyzer._parse_title_xml(xml_data) if xml_data else None
+    if root is None:
+        return None
+
+    extracted = {}
+    try:
+        for ref in refs:
+            ref_key = _worker_analyzer._create_ref_key(ref)
+            extracted[ref_key] = _worker_analyzer._extract_text_for_reference(root, ref)
+    finally:
+        # Element texts, matches and the DIV index only hold for one title
+        _worker_analyzer.element_text_cache.clear()
+        _worker_analyzer.level_match_cache.clear()
+        _worker_analyzer.div_index_cache.clear()
+
+    title_process_time = time.perf_counter() - title_start_time
+    logger.info(
+        f"Completed processing title {title_number} in {title_process_time:.2f} seconds"
+    )
+    return extracted
+
 
 class BaseECFRAnalyzer:
     """Base class for eCFR data analysis providing common functionality."""
 
-    def __init__(self):
-        """Initialize the base analyzer with common data structures."""
+    def __init__(self, agencies_data=None):
+        """Initialize the base analyzer with common data structures.
+
+        Args:
+            agencies_data: Optional agencies data already loaded by the caller,
+                so analyzers created together share one parse of agencies.json
+        """
         self.data_dir = Path("data")
         self.raw_dir = self.data_dir / "raw"
         self.xml_dir = self.raw_dir / "text"
         self.analysis_dir = self.data_dir / "analysis"
         self.admin_dir = self.data_dir / "admin"
+        self.text_cache_dir = self.data_dir / "cache" / "text"
 
         # Ensure directory structure exists
         self.analysis_dir.mkdir(parents=True, exist_ok=True)
         self.xml_dir.mkdir(parents=True, exist_ok=True)
+        self.text_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Load agencies data, unless the caller already has it
+        if agencies_data is None:
+            agencies_file = self.admin_dir / "agencies.json"
+            if not agencies_file.exists():
+                raise FileNotFoundError(f"Agencies file not found: {agencies_file}")
 
-        # Load agencies data
-        agencies_file = self.admin_dir / "agencies.json"
-        if not agencies_file.exists():
-            raise FileNotFoundError(f"Agencies file not found: {agencies_file}")
+            agencies_data = load_json(agencies_file)
 
-        with open(agencies_file, "r") as f:
-            self.agencies_data = json.load(f)
+        self.agencies_data = agencies_data
+        self.agency_by_slug, self.agency_parent_by_slug = self._build_agency_index()
 
         # Initialize caches
-        self.xml_data_cache = {}  # Cache for XML data by title
         self.extracted_text_cache = {}  # Cache for extracted text by ref_key
+        self.div_index_cache = {}  # DIV element index by root, per title
+        self.element_text_cache = {}  # Text by element of the title being extracted
+        self.level_match_cache = {}  # Matched elements by hierarchy prefix, per title
         self.title_agency_mapping = None  # Will be populated during analysis
+        self.title_file_index = None  # Newest XML file by title, built on first lookup
+        self.agency_cfr_references = (
+            None  # CFR references by agency, built on first use
+        )
 
-    def _load_title_data(self, title_number):
-        """Load XML data for a specific title from files.
+        # Worker processes used to extract titles in parallel
+        self.max_workers = os.cpu_count() or 1
+
+    def _find_title_file(self, title_number):
+        """Find the most recent XML file for a specific title.
 
         Args:
-            title_number: The CFR title number to load
+            title_number: The CFR title number to look up
 
         Returns:
-            XML data as string or None if not found
+            Path to the XML file or None if not found
         """
-        # Check if already cached
-        if title_number in self.xml_data_cache:
-            return self.xml_data_cache[title_number]
-
-        # First, try to find the file with the specific date format
-        files = list(self.xml_dir.glob(f"title_{title_number}_*_full_text.xml"))
+        # Scan the directory once rather than globbing it for every title
+        if self.title_file_index is None:
+            self.title_file_index = self._build_title_file_index()
 
-        if not files:
+        xml_file = self.title_file_index.get(str(title_number))
+        if not xml_file:
             logger.warning(
                 f"XML file not found for title {title_number}: {self.xml_dir}/title_{title_number}_*_full_text.xml"
             )
-            return None
+        return xml_file
+
+    def _build_title_file_index(self):
+        """Index the most recent XML file of every title in the XML directory.
+
+        Returns:
+            Dictionary mapping title numbers (as strings) to XML file paths
+        """
+        if not self.xml_dir.is_dir():
+            return {}
+
+        # A single scandir pass with plain string checks; Path objects are
+        # only built for the files that end up in the index
+        newest = {}
+        with os.scandir(self.xml_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("title_") and name.endswith("_full_text.xml")):
+                    continue
+                # title_<number>_<date>_full_text.xml
+                parts = name.split("_", 3)
+                if len(parts) < 4:
+                    continue
+                title, date = parts[1], parts[2]
+                # Use the most recent file (by date) for each title
+                if title not in newest or date > newest[title][0]:
+                    newest[title] = (date, name)
+
+        return {title: self.xml_dir / name for title, (date, name) in newest.items()}
+
+    def _extract_title_file_date(self, xml_file):
+        """Extract the issue date from a title XML filename.
+
+        Args:
+            xml_file: Path of the form title_1_2023-01-01_full_text.xml
 
-        # Sort by date (newest first) if there are multiple files
-        if len(files) > 1:
-            # Extract date from filename (format: title_1_2023-01-01_full_text.xml)
-            def extract_date(filename):
-                parts = filename.stem.split("_")
-                # The date is typically the third element (index 2)
-                if len(parts) >= 4:
-                    return parts[2]
-                return ""
+        Returns:
+            Date string or empty string if the name doesn't match
+        """
+        parts = xml_file.name.split("_", 3)
+        # The date is the third element (index 2)
+        if len(parts) >= 4:
+            return parts[2]
+        return ""
 
-            files.sort(key=extract_date, reverse=True)
+    def _load_title_data(self, title_number):
+        """Load XML data for a specific title from files.
 
-        # Use the most recent file
-        xml_file = files[0]
+        Args:
+            title_number: The CFR title number to load
+
+        Returns:
+            XML data as bytes or None if not found
+        """
+        xml_file = self._find_title_file(title_number)
+        if not xml_file:
+            return None
 
         try:
-            with open(xml_file, "r", encoding="utf-8") as f:
+            # Read raw bytes so lxml can honor the document's encoding declaration
+            with open(xml_file, "rb") as f:
                 xml_data = f.read()
 
-            # Cache the data
-            self.xml_data_cache[title_number] = xml_data
             logger.info(f"Loaded XML data for title {title_number} from {xml_file}")
             return xml_data
         except Exception as e:
             logger.error(f"Error loading title {title_number}: {e}")
             return None
 
-    def _get_agency_cfr_references(self) -> Dict[str, List[Dict]]:
-        """Extract all CFR references for each agency.
+    def _get_text_cache_file(self, title_number, xml_file):
+        """Get the on-disk cache file for a title's extracted reference text.
+
+        Args:
+            title_number: The CFR title number
+            xml_file: Path to the XML file the text is extracted from
 
         Returns:
-            Dictionary mapping agency slugs to lists of CFR reference dictionaries
+            Path to the compressed cache file
         """
-        references = {}
-        count_parent = 0
-        count_child = 0
+        # Key on the file's size and modification time too, so a re-downloaded
+        # title with the same date doesn't reuse stale text, and on the cache
+        # format so text stored by older versions isn't reused
+        date = self._extract_title_file_date(xml_file)
+        stat = xml_file.stat()
+        return (
+            self.text_cache_dir
+            / f"title_{title_number}_{date}.{stat.st_size}.{stat.st_mtime_ns}.v{TEXT_CACHE_VERSION}.json.zst"
+        )
 
-        # Process top-level agencies
-        for agency in self.agencies_data.get("agencies", []):
-            agency_slug = agency.get("slug", "")
-            if not agency_slug:
-                continue
+    def _load_cached_title_texts(self, cache_file):
+        """Load extracted reference text for a title from the on-disk cache.
 
-            count_parent += 1
+        Args:
+            cache_file: Path to the compressed cache file
 
-            # Get references for this agency
-            agency_refs = agency.get("cfr_references", [])
-            references[agency_slug] = agency_refs
+        Returns:
+            Dictionary mapping ref_key to (text, description), empty if not cached
+        """
+        if not cache_file.exists():
+            return {}
 
-            # Process child agencies if any
-            for child in agency.get("children", []):
-                child_slug = child.get("slug", "")
-                if not child_slug:
-                    continue
+        try:
+            raw = zstandard.ZstdDecompressor().decompress(cache_file.read_bytes())
+            entries = orjson.loads(raw)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable text cache {cache_file}: {e}")
+            return {}
+
+        return {tuple(ref_key): (text, desc) for ref_key, text, desc in entries}
+
+    def _save_cached_title_texts(self, cache_file, ref_keys):
+        """Save extracted reference text for a title to the on-disk cache.
+
+        Args:
+            cache_file: Path to the compressed cache file
+            ref_keys: Reference keys of the title to store
+        """
+        entries = [
+            [list(ref_key), *self.extracted_text_cache[ref_key]]
+            for ref_key in ref_keys
+            if ref_key in self.extracted_text_cache
+        ]
+        data = orjson.dumps(entries)
+        cache_file.write_bytes(zstandard.ZstdCompressor(level=3).compress(data))
+        logger.info(f"Saved {len(entries)} extracted texts to {cache_file}")
+
+    def _get_agency_cfr_references(self) -> Dict[str, List[Dict]]:
+        """Extract all CFR references for each agency.
 
-                count_child += 1
+        The agencies data is fixed for the analyzer's lifetime, so the mapping
+        is built once and shared by every analysis; callers must not mutate it.
 
-                # Get references for this child agency
-                child_refs = child.get("cfr_references", [])
-                references[child_slug] = child_refs
+        Returns:
+            Dictionary mapping agency slugs to lists of CFR reference dictionaries
+        """
+        if self.agency_cfr_references is not None:
+            return self.agency_cfr_references
+
+        references = {
+            agency_slug: agency.get("cfr_references", [])
+            for agency_slug, agency in self.agency_by_slug.items()
+        }
+        count_child = len(self.agency_parent_by_slug)
+        count_parent = len(references) - count_child
 
         logger.info(
             f"Found {sum(len(refs) for refs in references.values())} CFR references across {len(references)} agencies"
@@ -142,6 +338,7 @@ class BaseECFRAnalyzer:
         logger.info(
             f"Total of {count_parent} parent agencies and {count_child} child agencies"
         )
+        self.agency_cfr_references = references
         return references
 
     def _build_agency_hierarchy(self) -> Dict[str, str]:
@@ -150,21 +347,36 @@ class BaseECFRAnalyzer:
         Returns:
             Dictionary mapping child agency slugs to parent agency slugs
         """
-        hierarchy = {}
+        return dict(self.agency_parent_by_slug)
 
-        # Process each top-level agency
+    def _build_agency_index(self):
+        """Index the agencies tree by slug in a single walk.
+
+        Agencies without a slug are skipped, along with the children of a
+        top-level agency without one.
+
+        Returns:
+            Tuple of (agency data by slug, parent slug by child agency slug)
+        """
+        agency_by_slug = {}
+        agency_parent_by_slug = {}
+
+        # Process top-level agencies
         for agency in self.agencies_data.get("agencies", []):
-            parent_slug = agency.get("slug", "")
-            if not parent_slug:
+            agency_slug = agency.get("slug", "")
+            if not agency_slug:
                 continue
 
-            # Map each child to this parent
+            agency_by_slug[agency_slug] = agency
+
+            # Process child agencies if any
             for child in agency.get("children", []):
                 child_slug = child.get("slug", "")
                 if child_slug:
-                    hierarchy[child_slug] = parent_slug
+                    agency_by_slug[child_slug] = child
+                    agency_parent_by_slug[child_slug] = agency_slug
 
-        return hierarchy
+        return agency_by_slug, agency_parent_by_slug
 
     def _create_ref_key(self, ref):
         """Create a unique key for a CFR reference.
@@ -183,10 +395,96 @@ class BaseECFRAnalyzer:
             ref.get("part", ""),
         )
 
-    def _extract_text_for_reference(self, xml_data, ref):
-        """Extract text for a specific CFR reference from the XML data.
+    def _get_div_index(self, root):
+        """Get the index of a parsed title's DIV elements, building it on first use.
+
+        DIV elements are numbered in document order, and each one records the
+        number of its last DIV descendant, so the DIVs below an element form
+        a contiguous range of numbers.
+
+        Args:
+            root: Root element of the title's parsed XML
+
+        Returns:
+            Tuple of (dictionary mapping each DIV element to its (number, last
+            descendant number), dictionary mapping each DIV tag to a tuple of
+            (sorted element numbers, matching (element, lowercased N) pairs))
+        """
+        div_index = self.div_index_cache.get(root)
+        if div_index is not None:
+            return div_index
+
+        # Number the DIVs as a single depth-first walk enters them; when the
+        # walk leaves an element, the last number handed out is that of its
+        # last DIV descendant
+        div_elements = []
+        positions = {}
+        for event, element in etree.iterwalk(
+            root, events=("start", "end"), tag=DIV_TAGS
+        ):
+            if event == "start":
+                positions[element] = len(div_elements)
+                div_elements.append(element)
+            else:
+                positions[element] = (positions[element], len(div_elements) - 1)
+
+        by_tag = {}
+        for i, element in enumerate(div_elements):
+            numbers, entries = by_tag.setdefault(element.tag, ([], []))
+            numbers.append(i)
+            entries.append(
+                (element, (element.get("N") or "").translate(ASCII_LOWER_TABLE))
+            )
+
+        div_index = (positions, by_tag)
+        self.div_index_cache[root] = div_index
+        return div_index
+
+    def _find_level_elements(self, div_index, parent, div_tag, value):
+        """Find the descendants of an element at a hierarchy level by their N attribute.
+
+        Args:
+            div_index: DIV index of the title from _get_div_index
+            parent: DIV element to search below
+            div_tag: DIV tag of the hierarchy level (e.g. "DIV3" for chapters)
+            value: Lowercased reference value the N attribute must contain
 
-        This parses the XML and finds the exact section specified by the reference,
+        Returns:
+            Matching elements in document order
+        """
+        positions, by_tag = div_index
+        first, last = positions[parent]
+        numbers, entries = by_tag.get(div_tag, ((), ()))
+
+        # Only DIVs numbered within the parent's range are its descendants
+        start = bisect.bisect_right(numbers, first)
+        end = bisect.bisect_right(numbers, last)
+        return [element for element, n in entries[start:end] if value in n]
+
+    def _parse_title_xml(self, xml_data):
+        """Parse a title's XML data into an lxml tree.
+
+        Args:
+            xml_data: XML data for the title
+
+        Returns:
+            Root element of the parsed tree, or None if parsing failed
+        """
+        # lxml's recovering parser tolerates malformed XML without a slower fallback
+        try:
+            root = etree.fromstring(xml_data, TITLE_XML_PARSER)
+        except (etree.XMLSyntaxError, ValueError) as e:
+            logger.error(f"Failed to parse XML: {e}")
+            return None
+
+        if root is None:
+            logger.error("Failed to parse XML: empty document")
+        return root
+
+    def _extract_text_for_reference(self, root, ref):
+        """Extract text for a specific CFR reference from a parsed title.
+
+        This finds the exact section specified by the reference in the title's tree,
         navigating through the CFR hierarchy:
         Title (DIV1) -> Subtitle (DIV2) -> Chapter (DIV3) ->
         Subchapter (DIV4) -> Part (DIV5) -> Subpart (DIV6) ->
@@ -196,50 +494,28 @@ class BaseECFRAnalyzer:
         a DIV8 element might be directly nested under a DIV3 without DIV4-DIV7 in between.
 
         Args:
-            xml_data: XML data for the title
+            root: Root element of the title's parsed XML (see _parse_title_xml)
             ref: CFR reference dictionary with title, subtitle, chapter, etc.
 
         Returns:
             Tuple of (extracted text, reference description)
         """
-        if not xml_data:
+        if root is None:
             return "", "No XML data"
 
         try:
-            # Use BeautifulSoup for parsing with more lenient error handling
-            try:
-                soup = BeautifulSoup(xml_data, "lxml-xml")
-            except Exception as e:
-                logger.warning(
-                    f"Failed to parse XML with lxml-xml parser: {e}. Trying html.parser instead."
-                )
-                try:
-                    soup = BeautifulSoup(xml_data, "html.parser")
-                except Exception as e2:
-                    logger.error(
-                        f"Failed to parse XML with html.parser: {e2}. Skipping this reference."
-                    )
-                    return "", f"Error parsing XML: {e2}"
-
             # Start by finding the title (DIV1)
             title_num = ref.get("title")
-            try:
-                div1_elements = soup.find_all("DIV1")
-            except Exception as e:
-                logger.warning(
-                    f"Failed to find DIV1 elements: {e}. Trying case-insensitive search."
-                )
-                # Try to find divs with case-insensitive search
-                div1_elements = soup.find_all(
-                    lambda tag: tag.name and tag.name.lower() == "div1"
-                )
+            div_index = self._get_div_index(root)
+            _, div1_entries = div_index[1].get("DIV1", ((), ()))
+            div1_elements = [element for element, _ in div1_entries]
 
             if not div1_elements:
                 logger.warning(
                     "No DIV1 elements found in XML. Trying to extract text from the whole document."
                 )
                 return (
-                    soup.get_text(separator=" ", strip=True),
+                    self._get_element_text(root),
                     f"Title {title_num} (full text)",
                 )
 
@@ -253,91 +529,52 @@ class BaseECFRAnalyzer:
             # Track the furthest level we've successfully matched
             last_matched_level = "title"
 
-            # Helper function to search for elements at any level with better error handling
-            def find_matching_elements(
-                parent_elements, div_tag, ref_key, level_name, level_desc
-            ):
-                nonlocal found_levels, description, last_matched_level
+            # The hierarchy values specified so far. References of a title
+            # sharing a prefix (e.g. the same chapter) share its matches.
+            level_prefix = (title_num,)
+
+            # Narrow the targets one hierarchy level at a time. A level the
+            # reference doesn't specify, or that has no match, is skipped so
+            # the search continues from the previous level's elements.
+            for div_tag, ref_key, level_desc in REFERENCE_LEVELS:
                 ref_value = ref.get(ref_key)
                 if not ref_value:
-                    return None  # No reference at this level
-
-                matched_elements = []
-                # Search in all parent elements
-                for parent in parent_elements:
-                    try:
-                        # Find all elements of this type within the parent
-                        divs = parent.find_all(div_tag, recursive=True)
-                        for div in divs:
-                            n = div.get("N")
-                            if n and ref_value.lower() in n.lower():
-                                matched_elements.append(div)
-                    except Exception as e:
-                        logger.warning(f"Error finding {div_tag} elements: {e}")
-                        continue
+                    continue  # No reference at this level
+
+                level_prefix += ((ref_key, ref_value),)
+                matched_elements = self.level_match_cache.get(level_prefix)
+                if matched_elements is None:
+                    # Descendant DIVs whose N contains the value, compared
+                    # case-insensitively, looked up in the title's DIV index
+                    matched_elements = []
+                    for parent in target_elements:
+                        try:
+                            matched_elements.extend(
+                                self._find_level_elements(
+                                    div_index, parent, div_tag, ref_value.lower()
+                                )
+                            )
+                        except Exception as e:
+                            logger.warning(f"Error finding {div_tag} elements: {e}")
+                            continue
+                    self.level_match_cache[level_prefix] = matched_elements
 
                 if matched_elements:
-                    found_levels.append(level_name)
+                    target_elements = matched_elements
+                    found_levels.append(ref_key)
                     description += f", {level_desc} {ref_value}"
-                    last_matched_level = level_name
-                    return matched_elements
-                return None
-
-            # Check for subtitle (DIV2)
-            div2_elements = find_matching_elements(
-                target_elements, "DIV2", "subtitle", "subtitle", "Subtitle"
-            )
-            if div2_elements:
-                target_elements = div2_elements
-
-            # Check for chapter (DIV3)
-            div3_elements = find_matching_elements(
-                target_elements, "DIV3", "chapter", "chapter", "Chapter"
-            )
-            if div3_elements:
-                target_elements = div3_elements
-
-            # Check for subchapter (DIV4)
-            div4_elements = find_matching_elements(
-                target_elements, "DIV4", "subchapter", "subchapter", "Subchapter"
-            )
-            if div4_elements:
-                target_elements = div4_elements
-
-            # Check for part (DIV5)
-            div5_elements = find_matching_elements(
-                target_elements, "DIV5", "part", "part", "Part"
-            )
-            if div5_elements:
-                target_elements = div5_elements
-
-            # Check for subpart (DIV6)
-            div6_elements = find_matching_elements(
-                target_elements, "DIV6", "subpart", "subpart", "Subpart"
-            )
-            if div6_elements:
-                target_elements = div6_elements
-
-            # Check for subject group (DIV7)
-            div7_elements = find_matching_elements(
-                target_elements, "DIV7", "subjgrp", "subjgrp", "Subject Group"
-            )
-            if div7_elements:
-                target_elements = div7_elements
-
-            # Check for section (DIV8)
-            div8_elements = find_matching_elements(
-                target_elements, "DIV8", "section", "section", "Section"
-            )
-            if div8_elements:
-                target_elements = div8_elements
+                    last_matched_level = ref_key
 
             # Extract text from the target elements
             text_parts = []
             for element in target_elements:
                 try:
-                    # Get all text within this element
-                    text = element.get_text(separator=" ", strip=True)
+                    # Get all text within this element, reusing it when
+                    # another reference of the title resolved to it
+                    text = self.element_text_cache.get(element)
+                    if text is None:
+                        text = self._get_element_text(element)
+                        self.element_text_cache[element] = text
                     if text:
                         text_parts.append(text)
                 except Exception as e:
@@ -345,9 +582,10 @@ class BaseECFRAnalyzer:
                     continue
 
             combined_text = " ".join(text_parts)
-            logger.info(
-                f"Extracted text for {description} ({len(combined_text)} chars, found levels: {', '.join(found_levels)}, deepest match: {last_matched_level})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Extracted text for {description} ({len(combined_text)} chars, found levels: {', '.join(found_levels)}, deepest match: {last_matched_level})"
+                )
 
             return combined_text, description
 
@@ -355,7 +593,121 @@ class BaseECFRAnalyzer:
             logger.error(f"Error extracting text for reference {ref}: {e}")
             return "", f"Error: {str(e)}"
 
-    def _process_agency_references(self, analysis_function):
+    def _get_element_text(self, element):
+        """Get the whitespace-stripped, lowercased text of an element and its descendants.
+
+        Every analysis matches words case-insensitively, so the text is
+        lowercased once here rather than by each analysis.
+
+        Args:
+            element: lxml element to extract text from
+
+        Returns:
+            Lowercased text strings of the subtree joined by single spaces
+        """
+        # Strip and drop the whitespace-only strings with map/filter so the
+        # per-string work stays in C instead of a generator expression
+        return " ".join(filter(None, map(str.strip, element.itertext()))).lower()
+
+    def _extract_title_texts(self, titles, title_to_agencies):
+        """Extract text for every uncached reference, one title per worker process.
+
+        Titles are independent, so each is loaded, parsed and extracted in a
+        separate process. Results are merged into extracted_text_cache and
+        persisted to the on-disk text cache.
+
+        Args:
+            titles: Title numbers to extract
+            title_to_agencies: Mapping from title number to {(agency_slug, ref_key): ref}
+        """
+        # Find each title's text cache file
+        cache_files = {}
+        for title_num in titles:
+            # Skip titles whose references are all in memory already, e.g.
+            # extracted by an earlier analysis sharing this cache
+            if all(
+                ref_key in self.extracted_text_cache
+                for _, ref_key in title_to_agencies[title_num]
+            ):
+                continue
+
+            xml_file = self._find_title_file(title_num)
+            if not xml_file:
+                logger.warning(f"Skipping title {title_num}: no XML data found")
+                continue
+
+            cache_files[title_num] = self._get_text_cache_file(title_num, xml_file)
+
+        # Read and decompress the cache files on a thread pool, overlapping
+        # their disk reads, and merge them in title order
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            cached_texts = executor.map(
+                self._load_cached_title_texts, cache_files.values()
+            )
+            for title_cached_texts in cached_texts:
+                for ref_key, cached in title_cached_texts.items():
+                    self.extracted_text_cache.setdefault(ref_key, cached)
+
+        # Find the references of each title that still need extracting
+        pending = {}
+        for title_num, cache_file in cache_files.items():
+            # The first reference seen for a ref_key is the one extracted
+            title_refs = {}
+            for (_, ref_key), ref in title_to_agencies[title_num].items():
+                title_refs.setdefault(ref_key, ref)
+
+            refs_to_extract = [
+                ref
+                for ref_key, ref in title_refs.items()
+                if ref_key not in self.extracted_text_cache
+            ]
+            if refs_to_extract:
+                pending[title_num] = (cache_file, list(title_refs), refs_to_extract)
+
+        if not pending:
+            return
+
+        max_workers = min(self.max_workers, len(pending))
+        logger.info(f"Extracting {len(pending)} titles with {max_workers} workers")
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_extraction_worker
+        ) as executor:
+            futures = {
+                executor.submit(_extract_title_references, title_num, refs): title_num
+                for title_num, (_, _, refs) in pending.items()
+            }
+            for future in tqdm(
+                as_completed(futures), total=len(futures), desc="Processing titles"
+            ):
+                title_num = futures[future]
+                cache_file, title_ref_keys, _ = pending[title_num]
+                try:
+                    extracted = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing title {title_num}: {e}")
+                    continue
+
+                if extracted is None:
+                    logger.warning(f"Skipping title {title_num}: no XML data found")
+                    continue
+
+                # Persist newly extracted text so later runs can skip the XML
+                self.extracted_text_cache.update(extracted)
+                self._save_cached_title_texts(cache_file, title_ref_keys)
+
+    def _use_process_pool(self, texts):
+        """Check whether a batch of texts is worth processing in worker processes.
+
+        Args:
+            texts: Texts to be processed
+
+        Returns:
+            True if there are several workers and at least POOL_MIN_CHARS of text
+        """
+        return self.max_workers > 1 and sum(map(len, texts)) >= POOL_MIN_CHARS
+
+    def _process_agency_references(self, analysis_function, prepare_texts=None):
         """Process all agency references and apply the given analysis function.
 
         This is the core method for iterating through agencies, titles, and references.
@@ -365,11 +717,14 @@ class BaseECFRAnalyzer:
         Args:
             analysis_function: Function that processes extracted text and returns results
                 The function should accept (agency_slug, ref_text, ref_desc)
+            prepare_texts: Optional function called once with the distinct non-empty
+                texts before analysis_function runs, e.g. to precompute per-text
+                results in parallel
 
         Returns:
             Analysis results organized by agency
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         logger.info("Starting to process agency references...")
         # Step 1: Get all agency references
@@ -378,14 +733,16 @@ class BaseECFRAnalyzer:
             f"Loaded {sum(len(refs) for refs in agency_refs.values())} total CFR references across {len(agency_refs)} agencies"
         )
 
-        # Step 2: Create inverse mapping from titles to agencies that reference them
-        title_to_agencies = defaultdict(list)
+        # Step 2: Create inverse mapping from titles to agencies that reference them.
+        # Keying by (agency_slug, ref_key) drops duplicate references up front,
+        # keeping the first complete reference for each pair.
+        title_to_agencies = defaultdict(dict)
         for agency_slug, refs in agency_refs.items():
             for ref in refs:
                 title_num = ref.get("title")
                 if title_num:
-                    # Store the complete reference along with the agency
-                    title_to_agencies[title_num].append((agency_slug, ref))
+                    agency_ref_pair = (agency_slug, self._create_ref_key(ref))
+                    title_to_agencies[title_num].setdefault(agency_ref_pair, ref)
 
         logger.info(
             f"Created inverse mapping from {len(title_to_agencies)} titles to agencies"
@@ -394,78 +751,33 @@ class BaseECFRAnalyzer:
         # Store for other methods to use
         self.title_agency_mapping = title_to_agencies
 
-        # Step 3: Initialize data structures
-        agency_results = defaultdict(dict)
-        processed_title_agency_pairs = (
-            set()
-        )  # Track processed pairs to avoid duplicates
-
-        # Step 4: Process one title at a time
+        # Step 3: Extract text for references that aren't cached yet
         titles_to_process = sorted(title_to_agencies.keys())
-        for title_num in tqdm(titles_to_process, desc="Processing titles"):
-            logger.info(f"\n--- Processing Title {title_num} ---")
-            title_start_time = time.time()
-
-            # 4.1: Load this title's data
-            xml_data = self._load_title_data(title_num)
-            if not xml_data:
-                logger.warning(f"Skipping title {title_num}: no XML data found")
-                continue
-
-            load_time = time.time() - title_start_time
-            logger.info(f"Loading title {title_num} took {load_time:.2f} seconds")
-
-            # Track references we've processed for this title to avoid duplicate work
-            processed_refs_for_title = set()
-
-            # 4.2: Process each agency referencing this title
-            for agency_slug, ref in title_to_agencies[title_num]:
-                # Create a unique key for this reference
-                ref_key = self._create_ref_key(ref)
-
-                # Skip if we've already processed this exact reference for this agency
-                agency_ref_pair = (agency_slug, ref_key)
-                if agency_ref_pair in processed_title_agency_pairs:
-                    continue
-
-                processed_title_agency_pairs.add(agency_ref_pair)
-
-                # Skip if we've already processed this reference for this title (reuse the cached result)
-                if ref_key in processed_refs_for_title:
-                    # If we've already processed this reference, use the cached text
-                    if ref_key in self.extracted_text_cache:
-                        ref_text, ref_desc = self.extracted_text_cache[ref_key]
-                        # Apply the analysis function
-                        result = analysis_function(agency_slug, ref_text, ref_desc)
-                        if result:
-                            agency_results[agency_slug][ref_key] = result
-                    continue
-
-                # Extract text for this specific reference
-                if ref_key not in self.extracted_text_cache:
-                    ref_text, ref_desc = self._extract_text_for_reference(xml_data, ref)
-                    self.extracted_text_cache[ref_key] = (ref_text, ref_desc)
-                    processed_refs_for_title.add(ref_key)
-                else:
-                    ref_text, ref_desc = self.extracted_text_cache[ref_key]
+        self._extract_title_texts(titles_to_process, title_to_agencies)
+
+        if prepare_texts:
+            ref_texts = {}
+            for title_num in titles_to_process:
+                for _, ref_key in title_to_agencies[title_num]:
+                    ref_text = self.extracted_text_cache.get(ref_key, ("", ""))[0]
+                    if ref_text:
+                        ref_texts[ref_text] = None
+            prepare_texts(list(ref_texts))
+
+        # Step 4: Initialize data structures
+        agency_results = defaultdict(dict)
 
+        # Step 5: Apply the analysis function to each agency's references
+        for title_num in titles_to_process:
+            for agency_slug, ref_key in title_to_agencies[title_num]:
                 # Apply the analysis function if we have text
+                ref_text, ref_desc = self.extracted_text_cache.get(ref_key, ("", ""))
                 if ref_text:
                     result = analysis_function(agency_slug, ref_text, ref_desc)
                     if result:
                         agency_results[agency_slug][ref_key] = result
 
-            # Free up memory (but keep the cache)
-            if title_num in self.xml_data_cache and len(titles_to_process) > 5:
-                # Only clear from cache if we have many titles to process
-                del self.xml_data_cache[title_num]
-
-            title_process_time = time.time() - title_start_time
-            logger.info(
-                f"Completed processing title {title_num} in {title_process_time:.2f} seconds"
-            )
-
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Total processing took {total_time:.2f} seconds")
 
         return agency_results
@@ -480,11 +792,14 @@ class BaseECFRAnalyzer:
         """
         output_file = self.analysis_dir / filename
 
-        # Convert any tuple keys to strings before serializing
-        results_json_safe = self._convert_for_json(results)
-
-        with open(output_file, "w") as f:
-            json.dump(results_json_safe, f, indent=2)
+        # The analyses key references by string, so results normally
+        # serialize directly; anything else, such as tuple keys or sets,
+        # is converted first
+        try:
+            dump_json(output_file, results, indent=PRETTY_ANALYSIS_JSON)
+        except TypeError:
+            results_json_safe = self._convert_for_json(results)
+            dump_json(output_file, results_json_safe, indent=PRETTY_ANALYSIS_JSON)
 
         logger.info(f"Saved {analysis_type} results to {output_file}")
 
@@ -538,18 +853,26 @@ class BaseECFRAnalyzer:
             including aggregated data from their children
         """
         logger.info("Rolling up agency totals to include child agencies...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
-        # Build agency hierarchy if not already built
-        agency_hierarchy = self._build_agency_hierarchy()
-
-        # Create a mapping from parent agencies to their children
+        # Create a mapping from parent agencies to their children, using the
+        # hierarchy built at init
         parent_to_children = defaultdict(list)
-        for child, parent in agency_hierarchy.items():
+        for child, parent in self.agency_parent_by_slug.items():
             parent_to_children[parent].append(child)
 
-        # Make a copy of the original data to avoid modifying it in place
-        updated_agency_data = copy.deepcopy(agency_data)
+        # Copy the original data to avoid modifying it in place. Only each
+        # agency's top-level dict and its references dict are changed below;
+        # references rolled up to a parent get new dicts, so the existing
+        # reference data can be shared.
+        updated_agency_data = {
+            agency_slug: (
+                {**data, "references": dict(data["references"])}
+                if "references" in data
+                else dict(data)
+            )
+            for agency_slug, data in agency_data.items()
+        }
 
         # First, collect all references for each agency to avoid double-counting
         agency_refs = {}
@@ -567,6 +890,7 @@ class BaseECFRAnalyzer:
 
             # Track references we've already counted for this parent
             counted_refs = set(agency_refs.get(parent_agency, set()))
+            parent_data = updated_agency_data[parent_agency]
 
             # Calculate additional metrics from children
             for child_agency in child_agencies:
@@ -577,74 +901,41 @@ class BaseECFRAnalyzer:
                 # Get child's references we haven't counted yet for the parent
                 child_refs = agency_refs.get(child_agency, set())
                 new_refs = child_refs - counted_refs
+                child_references = updated_agency_data[child_agency].get(
+                    "references", {}
+                )
 
                 # Add child's data to parent for new references
                 for ref_key in new_refs:
                     # Skip if child doesn't have data for this reference
-                    if "references" not in updated_agency_data[child_agency]:
-                        continue
-                    if ref_key not in updated_agency_data[child_agency]["references"]:
+                    if ref_key not in child_references:
                         continue
+                    child_ref_data = child_references[ref_key]
 
                     # Add reference to parent if it doesn't exist
-                    if "references" not in updated_agency_data[parent_agency]:
-                        updated_agency_data[parent_agency]["references"] = {}
-                    if ref_key not in updated_agency_data[parent_agency]["references"]:
-                        updated_agency_data[parent_agency]["references"][ref_key] = {}
-
-                    # Add the reference metric to parent total
-                    child_ref_data = updated_agency_data[child_agency]["references"][
-                        ref_key
-                    ]
+                    parent_references = parent_data.setdefault("references", {})
+                    parent_ref_data = parent_references.setdefault(ref_key, {})
 
                     # If ref_data_key is provided, use it to get the specific metric
                     if ref_data_key:
                         if ref_data_key not in child_ref_data:
                             continue
-
-                        # Initialize the metric in parent if needed
-                        if (
-                            ref_key
-                            not in updated_agency_data[parent_agency]["references"]
-                        ):
-                            updated_agency_data[parent_agency]["references"][
-                                ref_key
-                            ] = {}
-                        if (
-                            ref_data_key
-                            not in updated_agency_data[parent_agency]["references"][
-                                ref_key
-                            ]
-                        ):
-                            updated_agency_data[parent_agency]["references"][ref_key][
-                                ref_data_key
-                            ] = 0
-
-                        # Add the metric value to parent
-                        updated_agency_data[parent_agency]["references"][ref_key][
-                            ref_data_key
-                        ] += child_ref_data[ref_data_key]
-
-                        # Update parent's total
-                        if metric_key not in updated_agency_data[parent_agency]:
-                            updated_agency_data[parent_agency][metric_key] = 0
-                        updated_agency_data[parent_agency][
-                            metric_key
-                        ] += child_ref_data[ref_data_key]
+                        metric_value = child_ref_data[ref_data_key]
+
+                        # Add the metric value to parent's reference and total
+                        parent_ref_data[ref_data_key] = (
+                            parent_ref_data.get(ref_data_key, 0) + metric_value
+                        )
+                        parent_data[metric_key] = (
+                            parent_data.get(metric_key, 0) + metric_value
+                        )
                     else:
                         # If no ref_data_key, just add the entire reference data to parent
-                        updated_agency_data[parent_agency]["references"][
-                            ref_key
-                        ] = child_ref_data
+                        parent_references[ref_key] = child_ref_data
 
                         # Update parent's total if there's a metric to add
-                        if (
-                            metric_key in child_ref_data
-                            and metric_key in updated_agency_data[parent_agency]
-                        ):
-                            updated_agency_data[parent_agency][
-                                metric_key
-                            ] += child_ref_data[metric_key]
+                        if metric_key in child_ref_data and metric_key in parent_data:
+                            parent_data[metric_key] += child_ref_data[metric_key]
 
                 # Mark these references as counted
                 counted_refs.update(new_refs)
@@ -671,7 +962,7 @@ class BaseECFRAnalyzer:
                         if metric_key in ref_data
                     )
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Completed agency rollup in {total_time:.2f} seconds")
 
         return updated_agency_data
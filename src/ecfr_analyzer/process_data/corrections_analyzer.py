@@ -2,14 +2,17 @@
 Corrections analyzer for eCFR data, tracking corrections made to agency regulations over time.
 """
 
-import json
 import logging
+import re
 import time
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
+import numpy as np
+
 from ecfr_analyzer.process_data.base_analyzer import BaseECFRAnalyzer
+from ecfr_analyzer.process_data.json_utils import load_json
 
 # Configure logging
 logging.basicConfig(
@@ -17,14 +20,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Year at the start of a correction date (format: YYYY-MM-DD), followed by the
+# first "-" or the end of the string, so "2023abc" and "20231-01-01" are rejected
+YEAR_PATTERN = re.compile(r"(\d{4})(?:-|$)")
+
 
 class CorrectionsAnalyzer(BaseECFRAnalyzer):
     """Analyzer for corrections made to agency regulations in the CFR."""
 
-    def __init__(self, data_dir=None):
-        """Initialize the corrections analyzer."""
+    def __init__(self, data_dir=None, agencies_data=None):
+        """Initialize the corrections analyzer.
+
+        Args:
+            data_dir: Unused, kept for compatibility
+            agencies_data: Optional agencies data already loaded by the caller
+        """
 
-        super().__init__()
+        super().__init__(agencies_data)
 
         # Directory for correction data
         self.corrections_dir = self.raw_dir / "corrections"
@@ -35,6 +47,9 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
         # Cache for loaded correction data
         self.corrections_cache = {}
 
+        # Cache of (hierarchy, output entry) pairs for each title's corrections
+        self.correction_entries_cache = {}
+
     def _load_title_corrections(self, title_number):
         """Load corrections for a specific title.
 
@@ -59,8 +74,7 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
 
         # Load the corrections data
         try:
-            with open(corrections_file, "r") as f:
-                corrections_data = json.load(f)
+            corrections_data = load_json(corrections_file)
 
             # Check if 'ecfr_corrections' key exists
             if "ecfr_corrections" in corrections_data:
@@ -82,6 +96,50 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
             self.corrections_cache[title_number] = []
             return []
 
+    def _get_title_correction_entries(self, title_number):
+        """Get the output entry of every CFR reference in a title's corrections.
+
+        Entries only depend on the correction, not on the agency it is matched
+        to, so they are built once per title and shared between agencies.
+
+        Args:
+            title_number: Title number to get correction entries for
+
+        Returns:
+            List of (correction hierarchy, correction entry) tuples
+        """
+        if title_number in self.correction_entries_cache:
+            return self.correction_entries_cache[title_number]
+
+        entries = []
+        for correction in self._load_title_corrections(title_number):
+            # Skip corrections without CFR references
+            if "cfr_references" not in correction:
+                continue
+
+            for cfr_ref in correction["cfr_references"]:
+                if "hierarchy" not in cfr_ref:
+                    continue
+
+                entries.append(
+                    (
+                        cfr_ref["hierarchy"],
+                        {
+                            "id": correction.get("id"),
+                            "corrective_action": correction.get("corrective_action"),
+                            "error_corrected": correction.get("error_corrected"),
+                            "error_occurred": correction.get("error_occurred"),
+                            "year": correction.get("year"),
+                            "fr_citation": correction.get("fr_citation"),
+                            "cfr_reference": cfr_ref.get("cfr_reference"),
+                            "hierarchy": cfr_ref.get("hierarchy"),
+                        },
+                    )
+                )
+
+        self.correction_entries_cache[title_number] = entries
+        return entries
+
     def _matches_reference(self, ref_key, correction_hierarchy, title_num):
         """Check if a correction hierarchy entry matches our reference key.
 
@@ -167,7 +225,7 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
             Dictionary with corrections data by agency
         """
         logger.info("Starting corrections analysis by agency...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Get agency references
         agency_references = self._get_agency_cfr_references()
@@ -193,42 +251,14 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
                 # Get the title number
                 title_num = ref_key[0]
 
-                # Load corrections for this title
-                title_corrections = self._load_title_corrections(title_num)
-
-                # Find relevant corrections for this reference
-                for correction in title_corrections:
-                    # Skip corrections without CFR references
-                    if "cfr_references" not in correction:
-                        continue
-
-                    # Check each CFR reference in the correction
-                    for cfr_ref in correction["cfr_references"]:
-                        if "hierarchy" not in cfr_ref:
-                            continue
-
-                        # Check if this correction applies to this reference
-                        if self._matches_reference(
-                            ref_key, cfr_ref["hierarchy"], title_num
-                        ):
-                            # Add this correction to the agency's list for this reference
-                            # Use a tuple of reference elements as the key
-                            agency_corrections[agency_slug][ref_key].append(
-                                {
-                                    "id": correction.get("id"),
-                                    "corrective_action": correction.get(
-                                        "corrective_action"
-                                    ),
-                                    "error_corrected": correction.get(
-                                        "error_corrected"
-                                    ),
-                                    "error_occurred": correction.get("error_occurred"),
-                                    "year": correction.get("year"),
-                                    "fr_citation": correction.get("fr_citation"),
-                                    "cfr_reference": cfr_ref.get("cfr_reference"),
-                                    "hierarchy": cfr_ref.get("hierarchy"),
-                                }
-                            )
+                # Find relevant corrections for this reference, checking each
+                # CFR reference of the title's corrections
+                for hierarchy, entry in self._get_title_correction_entries(title_num):
+                    # Check if this correction applies to this reference
+                    if self._matches_reference(ref_key, hierarchy, title_num):
+                        # Add this correction to the agency's list for this reference
+                        # Use a tuple of reference elements as the key
+                        agency_corrections[agency_slug][ref_key].append(entry)
 
         # Calculate totals for each agency
         agency_totals = defaultdict(int)
@@ -251,12 +281,16 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
                         title_totals[title_num] += 1
                         counted_corrections.add(corr_id)
 
-        # Prepare the agency data structure for the roll-up function
+        # Prepare the agency data structure for the roll-up function;
+        # references are keyed by their string form, as they are saved
         agency_data = {
             agency_slug: {
                 "total": agency_totals[agency_slug],
                 "references": {
-                    ref_key: {"count": len(corrections), "corrections": corrections}
+                    str(ref_key): {
+                        "count": len(corrections),
+                        "corrections": corrections,
+                    }
                     for ref_key, corrections in ref_corrections.items()
                 },
             }
@@ -279,7 +313,7 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
         # Also analyze corrections over time
         self.analyze_corrections_over_time(agency_corrections)
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Corrections analysis took {total_time:.2f} seconds")
         logger.info(f"Total corrections: {len(counted_corrections)}")
 
@@ -308,7 +342,7 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
             Dictionary with corrections over time data
         """
         logger.info("Starting analysis of corrections over time...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # If agency_corrections not provided, get them
         if agency_corrections is None:
@@ -316,37 +350,35 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
             self.analyze_corrections_by_agency()
             return  # The below will be called by analyze_corrections_by_agency
 
-        # Build agency hierarchy if not already built
-        agency_hierarchy = self._build_agency_hierarchy()
-
-        # Create a mapping of child agencies to their parents
-        child_to_parent = {}
-        for child, parent in agency_hierarchy.items():
-            child_to_parent[child] = parent
-
-        # Create sets of parent and child agencies
+        # Create sets of parent and child agencies from the hierarchy built at init
         parent_agencies = set()
         child_agencies = set()
 
-        for child, parent in child_to_parent.items():
+        for child, parent in self.agency_parent_by_slug.items():
             child_agencies.add(child)
             parent_agencies.add(parent)
 
-        # Initialize results structure
-        years_data = {}
-        all_years = set()
+        # Index agencies so per-year counts can live in a single 2D table
+        agency_slugs = list(agency_corrections.keys())
+        slug_to_idx = {slug: i for i, slug in enumerate(agency_slugs)}
 
-        # Process corrections by year for each agency
-        for agency_slug, ref_corrections in agency_corrections.items():
-            # Determine if this is a parent or child agency
-            is_parent = agency_slug in parent_agencies
-            is_child = agency_slug in child_agencies
+        # Collect unique (agency, year, correction) triples so each correction is
+        # counted once per agency, plus the unique correction IDs per year
+        agency_year_ids = set()
+        all_correction_ids = defaultdict(set)
 
-            # We need to count each unique correction once per agency
-            counted_corrections_by_year = defaultdict(set)
+        # The same correction shows up under many agencies and references, so
+        # each distinct date is only parsed once (None marks an invalid date)
+        year_by_date = {}
 
-            # Process each reference and its corrections
-            for ref_key, corrections in ref_corrections.items():
+        # Bind the methods used for every correction once, outside the loops
+        add_agency_year_id = agency_year_ids.add
+        match_year = YEAR_PATTERN.match
+
+        for agency_slug, ref_corrections in agency_corrections.items():
+            agency_idx = slug_to_idx[agency_slug]
+
+            for corrections in ref_corrections.values():
                 for correction in corrections:
                     # Extract year from error_corrected date
                     corrected_date = correction.get("error_corrected")
@@ -355,90 +387,95 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
                     if not corrected_date or not correction_id:
                         continue
 
-                    # Extract year from date (format: YYYY-MM-DD)
-                    try:
-                        year = int(corrected_date.split("-")[0])
-                        all_years.add(year)
-
-                        # Add this correction to the set for this year
-                        counted_corrections_by_year[year].add(correction_id)
-                    except (ValueError, IndexError, AttributeError):
-                        # Skip corrections with invalid dates
+                    # Skip non-string dates before the memo lookup, as lists
+                    # and dicts cannot be hashed
+                    if not isinstance(corrected_date, str):
                         continue
 
-            # Now add the counted corrections to the appropriate category in years_data
-            for year, correction_ids in counted_corrections_by_year.items():
-                if year not in years_data:
-                    years_data[year] = {
-                        "total": 0,
-                        "parent_agencies": defaultdict(int),
-                        "child_agencies": defaultdict(int),
-                        "all_agencies": defaultdict(int),
-                    }
+                    if corrected_date in year_by_date:
+                        year = year_by_date[corrected_date]
+                    else:
+                        # Extract year from date without raising on bad input
+                        match = match_year(corrected_date)
+                        year = int(match.group(1)) if match else None
+                        year_by_date[corrected_date] = year
 
-                # Add to the appropriate agency category
-                agency_count = len(correction_ids)
+                    # Skip corrections with invalid dates
+                    if year is None:
+                        continue
 
-                if is_parent:
-                    years_data[year]["parent_agencies"][agency_slug] = agency_count
+                    add_agency_year_id((agency_idx, year, correction_id))
+                    all_correction_ids[year].add(correction_id)
 
-                if is_child:
-                    years_data[year]["child_agencies"][agency_slug] = agency_count
+        all_years = sorted(all_correction_ids.keys())
+        year_to_idx = {year: i for i, year in enumerate(all_years)}
 
-                # Add to all_agencies regardless
-                years_data[year]["all_agencies"][agency_slug] = agency_count
+        # Structure-of-arrays layout: one int64 row per agency, one column per year
+        table = np.zeros((len(agency_slugs), len(all_years)), dtype=np.int64)
+        if agency_year_ids:
+            slug_idx_array = np.fromiter(
+                (agency_idx for agency_idx, _, _ in agency_year_ids),
+                dtype=np.int64,
+                count=len(agency_year_ids),
+            )
+            year_idx_array = np.fromiter(
+                (year_to_idx[year] for _, year, _ in agency_year_ids),
+                dtype=np.int64,
+                count=len(agency_year_ids),
+            )
+            np.add.at(table, (slug_idx_array, year_idx_array), 1)
 
-                # Note: We don't add to the total yet to avoid double-counting
+        is_parent = np.array(
+            [slug in parent_agencies for slug in agency_slugs], dtype=bool
+        )
+        is_child = np.array(
+            [slug in child_agencies for slug in agency_slugs], dtype=bool
+        )
 
-        # Now calculate the total for each year across all agencies, avoiding double-counting
-        all_correction_ids = defaultdict(set)
+        # Only convert back to nested dicts for serialization
+        years_data = {}
+        for year_idx, year in enumerate(all_years):
+            year_counts = table[:, year_idx]
+            year_entry = {
+                "total": len(all_correction_ids[year]),
+                "parent_agencies": {},
+                "child_agencies": {},
+                "all_agencies": {},
+            }
 
-        for agency_slug, ref_corrections in agency_corrections.items():
-            for ref_key, corrections in ref_corrections.items():
-                for correction in corrections:
-                    corrected_date = correction.get("error_corrected")
-                    correction_id = correction.get("id")
+            for agency_idx in np.flatnonzero(year_counts):
+                agency_slug = agency_slugs[agency_idx]
+                agency_count = int(year_counts[agency_idx])
 
-                    if not corrected_date or not correction_id:
-                        continue
+                if is_parent[agency_idx]:
+                    year_entry["parent_agencies"][agency_slug] = agency_count
 
-                    try:
-                        year = int(corrected_date.split("-")[0])
-                        all_correction_ids[year].add(correction_id)
-                    except (ValueError, IndexError, AttributeError):
-                        continue
+                if is_child[agency_idx]:
+                    year_entry["child_agencies"][agency_slug] = agency_count
 
-        # Update the total counts
-        for year, correction_ids in all_correction_ids.items():
-            if year in years_data:
-                years_data[year]["total"] = len(correction_ids)
+                # Add to all_agencies regardless
+                year_entry["all_agencies"][agency_slug] = agency_count
 
-        # Convert defaultdicts to regular dicts for serialization
-        for year in years_data:
-            years_data[year]["parent_agencies"] = dict(
-                years_data[year]["parent_agencies"]
-            )
-            years_data[year]["child_agencies"] = dict(
-                years_data[year]["child_agencies"]
-            )
-            years_data[year]["all_agencies"] = dict(years_data[year]["all_agencies"])
+            years_data[year] = year_entry
 
         # Calculate top agencies across all years
-        top_agencies = self._calculate_top_correction_agencies(years_data)
+        top_agencies = self._calculate_top_correction_agencies(
+            table, agency_slugs, is_parent, is_child
+        )
 
         # Prepare the final data structure
         corrections_over_time = {
             "timestamp": datetime.now().isoformat(),
             "years": dict(years_data),
             "top_agencies": top_agencies,
-            "min_year": min(all_years) if all_years else None,
-            "max_year": max(all_years) if all_years else None,
+            "min_year": all_years[0] if all_years else None,
+            "max_year": all_years[-1] if all_years else None,
         }
 
         # Convert any tuples or other non-JSON-serializable types
         corrections_over_time = self._convert_for_json(corrections_over_time)
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Corrections over time analysis took {total_time:.2f} seconds")
 
         # Save the results
@@ -448,44 +485,34 @@ class CorrectionsAnalyzer(BaseECFRAnalyzer):
 
         return corrections_over_time
 
-    def _calculate_top_correction_agencies(self, years_data):
+    def _calculate_top_correction_agencies(
+        self, table, agency_slugs, is_parent, is_child, limit=20
+    ):
         """Calculate the top agencies by total corrections across all years.
 
         Args:
-            years_data: Dictionary of years data from analyze_corrections_over_time
+            table: Agency-by-year correction counts from analyze_corrections_over_time
+            agency_slugs: Agency slugs in table row order
+            is_parent: Boolean mask of parent agencies in table row order
+            is_child: Boolean mask of child agencies in table row order
+            limit: Number of agencies to keep in each category
 
         Returns:
             Dictionary with top agencies in different categories
         """
         # Aggregate corrections by agency across all years
-        total_by_agency = defaultdict(int)
-        total_by_parent_agency = defaultdict(int)
-        total_by_child_agency = defaultdict(int)
-
-        for year_data in years_data.values():
-            # All agencies
-            for agency, count in year_data["all_agencies"].items():
-                total_by_agency[agency] += count
-
-            # Parent agencies
-            for agency, count in year_data["parent_agencies"].items():
-                total_by_parent_agency[agency] += count
-
-            # Child agencies
-            for agency, count in year_data["child_agencies"].items():
-                total_by_child_agency[agency] += count
-
-        # Get top 20 agencies in each category
-        top_all = sorted(total_by_agency.items(), key=lambda x: x[1], reverse=True)[:20]
-        top_parents = sorted(
-            total_by_parent_agency.items(), key=lambda x: x[1], reverse=True
-        )[:20]
-        top_children = sorted(
-            total_by_child_agency.items(), key=lambda x: x[1], reverse=True
-        )[:20]
+        totals = table.sum(axis=1)
+
+        def top_for(mask):
+            candidates = np.flatnonzero(mask & (totals > 0))
+            order = np.argsort(-totals[candidates], kind="stable")[:limit]
+            return {
+                agency_slugs[agency_idx]: int(totals[agency_idx])
+                for agency_idx in candidates[order]
+            }
 
         return {
-            "all": dict(top_all),
-            "parents": dict(top_parents),
-            "children": dict(top_children),
+            "all": top_for(np.ones(len(agency_slugs), dtype=bool)),
+            "parents": top_for(is_parent),
+            "children": top_for(is_child),
         }
@@ -4,7 +4,6 @@ historical changes, DEI footprint, and bureaucracy metrics.
 """
 
 import logging
-import json
 
 from collections import defaultdict
 from datetime import datetime
@@ -21,6 +20,11 @@ logger = logging.getLogger(__name__)
 # Import the eCFR API client and new analyzer modules
 from ecfr_analyzer.process_data.ecfr_api import ECFRApiClient
 from ecfr_analyzer.process_data.base_analyzer import BaseECFRAnalyzer
+from ecfr_analyzer.process_data.json_utils import (
+    dump_json,
+    load_json,
+    write_json_if_changed,
+)
 from ecfr_analyzer.process_data.word_count_analyzer import WordCountAnalyzer
 from ecfr_analyzer.process_data.footprint_analyzer import (
     FootprintAnalyzer,
@@ -55,20 +59,29 @@ class ECFRDataAnalyzer:
         self.xml_dir.mkdir(parents=True, exist_ok=True)
         self.analysis_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize the specialized analyzers
-        self.base_analyzer = BaseECFRAnalyzer()
-        self.word_count_analyzer = WordCountAnalyzer()
-        self.footprint_analyzer = FootprintAnalyzer()
-        self.corrections_analyzer = CorrectionsAnalyzer()
-
-        # Share the word count analyzer with the footprint analyzer for efficiency
-        self.footprint_analyzer.word_count_analyzer = self.word_count_analyzer
-
         # Load API client for data access
         self.api_client = ECFRApiClient()
         self.title_summary = self._load_title_summary()
         self.agencies_data = self._load_agencies_data()
 
+        # Initialize the specialized analyzers, sharing the agencies data
+        # loaded above so agencies.json is parsed once per instance
+        self.base_analyzer = BaseECFRAnalyzer(self.agencies_data)
+        self.word_count_analyzer = WordCountAnalyzer(self.agencies_data)
+        self.footprint_analyzer = FootprintAnalyzer(self.agencies_data)
+        self.corrections_analyzer = CorrectionsAnalyzer(
+            agencies_data=self.agencies_data
+        )
+
+        # Share the word count analyzer with the footprint analyzer for efficiency
+        self.footprint_analyzer.word_count_analyzer = self.word_count_analyzer
+
+        # Share extracted reference text too, so titles extracted (or loaded from
+        # the text cache) for the word count are reused by every footprint
+        self.footprint_analyzer.extracted_text_cache = (
+            self.word_count_analyzer.extracted_text_cache
+        )
+
         # Maps titles to agencies
         self.title_agency_map = self._build_title_agency_map()
 
@@ -89,12 +102,10 @@ class ECFRDataAnalyzer:
         if not title_summary_file.exists():
             # If file doesn't exist, fetch it from the API
             title_summary_data = self.api_client.get_title_summary()
-            with open(title_summary_file, "w") as f:
-                json.dump(title_summary_data, f, indent=2)
+            dump_json(title_summary_file, title_summary_data)
             return title_summary_data
 
-        with open(title_summary_file, "r") as f:
-            return json.load(f)
+        return load_json(title_summary_file)
 
     def _build_title_agency_map(self) -> Dict[str, List[str]]:
         """Build a mapping from title number to agency slugs.
@@ -102,7 +113,8 @@ class ECFRDataAnalyzer:
         Returns:
             Dictionary mapping title numbers to list of agency slugs
         """
-        title_agency_map = defaultdict(list)
+        # Use sets while building so duplicate agencies are dropped in O(1)
+        title_agency_map = defaultdict(set)
 
         # Process top-level agencies first
         for agency in self.agencies_data.get("agencies", []):
@@ -113,7 +125,7 @@ class ECFRDataAnalyzer:
                 title_num = cfr_ref.get("title")
                 if title_num:
                     # Store title number as string for consistent lookup
-                    title_agency_map[str(title_num)].append(agency_slug)
+                    title_agency_map[str(title_num)].add(agency_slug)
 
             # Process children
             for child in agency.get("children", []):
@@ -124,27 +136,30 @@ class ECFRDataAnalyzer:
                     title_num = cfr_ref.get("title")
                     if title_num:
                         # Store as string
-                        title_agency_map[str(title_num)].append(child_slug)
+                        title_agency_map[str(title_num)].add(child_slug)
                         # Also add the parent agency for this title
-                        if (
-                            agency_slug
-                            and agency_slug not in title_agency_map[str(title_num)]
-                        ):
-                            title_agency_map[str(title_num)].append(agency_slug)
+                        if agency_slug:
+                            title_agency_map[str(title_num)].add(agency_slug)
+
+        # Convert to sorted lists for stable output
+        title_agency_map = {
+            title: sorted(agencies) for title, agencies in title_agency_map.items()
+        }
 
         # Debug information about the mapping
         logger.info(
             f"Built title-agency map with {len(title_agency_map) + 1} title entries"
         )
-        for title, agencies in sorted(title_agency_map.items()):
-            logger.info(f"Title {title} -> {len(agencies)} agencies")
+        if logger.isEnabledFor(logging.DEBUG):
+            for title, agencies in sorted(title_agency_map.items()):
+                logger.debug(f"Title {title} -> {len(agencies)} agencies")
 
         # Save the title-agency map
-        output_file = self.admin_dir / "title_agency_map.json"
-        with open(output_file, "w") as f:
-            json.dump(dict(title_agency_map), f, indent=2)
+        write_json_if_changed(
+            self.admin_dir / "title_agency_map.json", title_agency_map
+        )
 
-        return dict(title_agency_map)
+        return title_agency_map
 
     def _generate_agency_hierarchy_map(self):
         """Generate and save a simplified hierarchical structure of agencies.
@@ -155,49 +170,43 @@ class ECFRDataAnalyzer:
         Returns:
             Dictionary with the hierarchical agency structure
         """
-        # Initialize the structure
-        hierarchy = {"timestamp": datetime.now().isoformat(), "agencies": []}
-
-        # Process top-level agencies
-        for agency in self.agencies_data.get("agencies", []):
-            # Create top-level agency entry
-            agency_entry = {
-                "slug": agency.get("slug", ""),
-                "name": agency.get("name", ""),
-                "children": [],
-            }
-
-            # Process children
-            for child in agency.get("children", []):
-                child_entry = {
-                    "slug": child.get("slug", ""),
-                    "name": child.get("name", ""),
-                }
-
-                # Add grandchildren if they exist
-                grandchildren = child.get("children", [])
-                if grandchildren:
-                    child_entry["children"] = [
-                        {
-                            "slug": grandchild.get("slug", ""),
-                            "name": grandchild.get("name", ""),
-                        }
-                        for grandchild in grandchildren
-                    ]
-
-                agency_entry["children"].append(child_entry)
-
-            # Add to main structure
-            hierarchy["agencies"].append(agency_entry)
+        # Build the structure, walking sub-agencies to any depth
+        hierarchy = {
+            "timestamp": datetime.now().isoformat(),
+            "agencies": [
+                self._build_hierarchy_entry(agency, include_empty_children=True)
+                for agency in self.agencies_data.get("agencies", [])
+            ],
+        }
 
         # Save to file
         output_path = ANALYSIS_DIR / "agency_hierarchy_map.json"
-        with open(output_path, "w") as f:
-            json.dump(hierarchy, f, indent=2)
+        dump_json(output_path, hierarchy)
 
         logger.info(f"Agency hierarchy saved to {output_path}")
         return hierarchy
 
+    def _build_hierarchy_entry(self, agency, include_empty_children=False):
+        """Build the hierarchy map entry for an agency and its sub-agencies.
+
+        Args:
+            agency: Agency data from the eCFR Admin API
+            include_empty_children: Whether to add an empty children list when the
+                agency has no sub-agencies (done for top-level agencies)
+
+        Returns:
+            Dictionary with the agency's slug, name and, recursively, children
+        """
+        entry = {"slug": agency.get("slug", ""), "name": agency.get("name", "")}
+
+        children = agency.get("children", [])
+        if children or include_empty_children:
+            entry["children"] = [
+                self._build_hierarchy_entry(child) for child in children
+            ]
+
+        return entry
+
     def _build_agency_hierarchy(self) -> Dict[str, str]:
         """Build a mapping of child agency slugs to parent agency slugs.
 
@@ -215,9 +224,9 @@ class ECFRDataAnalyzer:
                     agency_hierarchy[child_slug] = parent_slug
 
         # Save the agency hierarchy
-        output_file = self.admin_dir / "agency_hierarchy.json"
-        with open(output_file, "w") as f:
-            json.dump(agency_hierarchy, f, indent=2)
+        write_json_if_changed(
+            self.admin_dir / "agency_hierarchy.json", agency_hierarchy
+        )
 
         return agency_hierarchy
 
@@ -231,12 +240,10 @@ class ECFRDataAnalyzer:
         if not agency_file.exists():
             # If file doesn't exist, fetch it from the API
             agencies_data = self.api_client.get_admin_agencies()
-            with open(agency_file, "w") as f:
-                json.dump(agencies_data, f, indent=2)
+            dump_json(agency_file, agencies_data)
             return agencies_data
 
-        with open(agency_file, "r") as f:
-            return json.load(f)
+        return load_json(agency_file)
 
     def analyze_word_count_by_agency(self):
         """Analyze word count for each agency based on their specific CFR references.
@@ -262,7 +269,7 @@ class ECFRDataAnalyzer:
 
         # Initialize footprint analyzer if needed
         if not self.footprint_analyzer:
-            self.footprint_analyzer = FootprintAnalyzer()
+            self.footprint_analyzer = FootprintAnalyzer(self.agencies_data)
 
         # Run the analysis
         result = self.footprint_analyzer.analyze_keyword_footprint(dei_keywords, "dei")
@@ -279,7 +286,7 @@ class ECFRDataAnalyzer:
 
         # Initialize footprint analyzer if needed
         if not self.footprint_analyzer:
-            self.footprint_analyzer = FootprintAnalyzer()
+            self.footprint_analyzer = FootprintAnalyzer(self.agencies_data)
 
         # Run the analysis
         result = self.footprint_analyzer.analyze_keyword_footprint(
@@ -299,7 +306,7 @@ class ECFRDataAnalyzer:
         """
         # Initialize footprint analyzer if needed
         if not self.footprint_analyzer:
-            self.footprint_analyzer = FootprintAnalyzer()
+            self.footprint_analyzer = FootprintAnalyzer(self.agencies_data)
 
         # Run the analysis
         result = self.footprint_analyzer.analyze_keyword_footprint(
@@ -316,7 +323,9 @@ class ECFRDataAnalyzer:
         """
         # Initialize corrections analyzer if needed
         if not self.corrections_analyzer:
-            self.corrections_analyzer = CorrectionsAnalyzer()
+            self.corrections_analyzer = CorrectionsAnalyzer(
+                agencies_data=self.agencies_data
+            )
 
         # Run the analysis
         result = self.corrections_analyzer.analyze_corrections_by_agency()
@@ -331,7 +340,9 @@ class ECFRDataAnalyzer:
         """
         # Initialize corrections analyzer if needed
         if not self.corrections_analyzer:
-            self.corrections_analyzer = CorrectionsAnalyzer()
+            self.corrections_analyzer = CorrectionsAnalyzer(
+                agencies_data=self.agencies_data
+            )
 
         # Run the analysis
         result = self.corrections_analyzer.analyze_corrections_over_time()
@@ -341,7 +352,7 @@ class ECFRDataAnalyzer:
     def run_all_analyses(self):
         """Run all analyses and compile results."""
         logger.info("Running all analyses...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Run each analysis
         self.analyze_word_count_by_agency()
@@ -371,11 +382,10 @@ class ECFRDataAnalyzer:
 
         # Save summary
         summary_file = self.analysis_dir / "analysis_summary.json"
-        with open(summary_file, "w") as f:
-            json.dump(self.summary, f, indent=2)
+        dump_json(summary_file, self.summary)
 
         # Log total time
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Analysis complete. Summary written to {summary_file}")
         logger.info(f"Total analysis time: {total_time:.2f} seconds")
         return self.summary
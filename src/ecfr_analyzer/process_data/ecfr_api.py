@@ -2,22 +2,27 @@
 ECFR API Client for accessing the Electronic Code of Federal Regulations API.
 """
 
+import hashlib
 import json
 import os
-import time
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 import logging
 import requests
 import zipfile
 import io
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
+from ecfr_analyzer.process_data.json_utils import dump_json, load_json
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -39,6 +44,9 @@ TEXT_DIR = RAW_DATA_DIR / "text"
 STRUCT_DIR = RAW_DATA_DIR / "struct"
 CACHE_DATA_DIR = DATA_DIR / "cache"
 
+# Number of title corrections downloaded concurrently
+CORRECTION_DOWNLOAD_WORKERS = 8
+
 # Ensure directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -62,6 +70,26 @@ class ECFRApiClient:
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
 
+        # Back off and retry when rate limited, instead of pausing between
+        # every request, with a connection pool large enough for the
+        # concurrent corrections downloads
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry, pool_maxsize=CORRECTION_DOWNLOAD_WORKERS
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Cached responses already read this session, by cache path:
+        # (file mtime, response data)
+        self.response_cache = {}
+
     def _get_cache_path(self, endpoint: str, params: Optional[Dict] = None) -> Path:
         """Generate a cache file path for an API endpoint.
 
@@ -72,19 +100,11 @@ class ECFRApiClient:
         Returns:
             Path to cache file
         """
-        # Create a simplified string representation of params for filename
-        params_str = ""
-        if params:
-            params_str = "_".join(f"{k}_{v}" for k, v in sorted(params.items()))
-            params_str = params_str.replace("/", "_").replace("\\", "_")
-
-        # Create a filename based on the endpoint, params and date
-        filename = (
-            f"{endpoint.replace('/', '_')}_{params_str}"
-            if params_str
-            else f"{endpoint.replace('/', '_')}"
-        )
-        return CACHE_DATA_DIR / filename
+        # Hash the endpoint and params into a short, collision-free filename,
+        # keeping the endpoint's extension so cached responses load by type
+        key_source = f"{endpoint}|{json.dumps(params or {}, sort_keys=True)}"
+        key = hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+        return CACHE_DATA_DIR / f"{key}{Path(endpoint).suffix}"
 
     def _get(self, url: str, params: Optional[Dict] = None, cache: bool = True) -> Dict:
         """Make a GET request to the API.
@@ -106,19 +126,27 @@ class ECFRApiClient:
         # Return cached response if recent enough
         if cache and cache_path.exists():
             logger.info(f"Checking cache age for {url}")
-            cache_age = datetime.now() - datetime.fromtimestamp(
-                cache_path.stat().st_mtime
-            )
+            cache_mtime = cache_path.stat().st_mtime
+            cache_age = datetime.now() - datetime.fromtimestamp(cache_mtime)
             if cache_age < timedelta(days=self.cache_days):
                 logger.info(f"Using cached response for {url}")
+                # Reuse the response if this session already read this file
+                cached = self.response_cache.get(cache_path)
+                if cached and cached[0] == cache_mtime:
+                    return cached[1]
+
+                data = None
                 # If cache_path is json then load json
                 if cache_path.suffix == ".json":
-                    with open(cache_path, "r") as f:
-                        return json.load(f)
+                    data = load_json(cache_path)
                 # If cache_path is xml then load xml
                 elif cache_path.suffix == ".xml":
                     with open(cache_path, "rb") as f:
-                        return f.read()
+                        data = f.read()
+
+                if data is not None:
+                    self.response_cache[cache_path] = (cache_mtime, data)
+                    return data
 
         # Make API request
         response = self.session.get(url, params=request_params)
@@ -134,8 +162,7 @@ class ECFRApiClient:
             data = response.json()
             # Cache response
             if cache:
-                with open(cache_path, "w") as f:
-                    json.dump(data, f, indent=2)
+                dump_json(cache_path, data)
 
         return data
 
@@ -256,8 +283,7 @@ def download_admin_data():
         logger.info("Downloading agency information...")
         agencies_data = client.get_admin_agencies()
         output_file = ADMIN_DATA_DIR / "agencies.json"
-        with open(output_file, "w") as f:
-            json.dump(agencies_data, f, indent=2)
+        dump_json(output_file, agencies_data)
         logger.info(f"Agency data saved to {output_file}")
     except Exception as e:
         logger.info(f"Error downloading agency data: {e}")
@@ -267,8 +293,7 @@ def download_admin_data():
         logger.info("Downloading title summary data...")
         title_summary_data = client.get_title_summary()
         output_file = ADMIN_DATA_DIR / "title_summary.json"
-        with open(output_file, "w") as f:
-            json.dump(title_summary_data, f, indent=2)
+        dump_json(output_file, title_summary_data)
         logger.info(f"Title summary data saved to {output_file}")
     except Exception as e:
         logger.info(f"Error downloading title summary data: {e}")
@@ -280,56 +305,93 @@ def download_admin_data():
 
         # Save the titles data
         output_file = ADMIN_DATA_DIR / "titles.json"
-        with open(output_file, "w") as f:
-            json.dump({"data": titles}, f, indent=2)
+        dump_json(output_file, {"data": titles})
         logger.info(f"Title data saved to {output_file}")
 
-        # Download title-specific corrections
+        # Download title-specific corrections. The requests are I/O bound, so
+        # they run on a thread pool sharing the client's session.
         logger.info("Downloading title-specific corrections...")
-        for title_info in tqdm(titles, desc="Downloading title corrections"):
-            try:
-                title_number = title_info.get("number", 0)
-                if title_number == 0:
-                    continue
+        title_numbers = [
+            title_info.get("number", 0)
+            for title_info in titles
+            if title_info.get("number", 0) != 0
+        ]
 
+        def download_title_corrections(title_number):
+            try:
                 corrections_data = client.get_title_corrections(title_number)
                 output_file = (
                     CORRECTION_DATA_DIR / f"title_{title_number}_corrections.json"
                 )
-                with open(output_file, "w") as f:
-                    json.dump(corrections_data, f, indent=2)
+                dump_json(output_file, corrections_data)
                 logger.info(f"Title {title_number} corrections saved to {output_file}")
-                time.sleep(1)  # Avoid rate limiting
             except Exception as e:
                 logger.info(
                     f"Error downloading corrections for title {title_number}: {e}"
                 )
 
+        with ThreadPoolExecutor(max_workers=CORRECTION_DOWNLOAD_WORKERS) as executor:
+            list(
+                tqdm(
+                    executor.map(download_title_corrections, title_numbers),
+                    total=len(title_numbers),
+                    desc="Downloading title corrections",
+                )
+            )
+
     except Exception as e:
         logger.info(f"Error in title corrections download process: {e}")
         # Create an empty titles file as fallback
         output_file = PROCESSED_DATA_DIR / "titles.json"
-        with open(output_file, "w") as f:
-            json.dump({"data": [{"number": i} for i in range(1, 51)]}, f, indent=2)
+        dump_json(output_file, {"data": [{"number": i} for i in range(1, 51)]})
         logger.info(f"Created fallback title data at {output_file}")
 
 
+def get_referenced_titles() -> Set[int]:
+    """Get the title numbers referenced by any agency or child agency.
+
+    Returns:
+        Set of title numbers, empty if agency data hasn't been downloaded
+    """
+    agencies_file = ADMIN_DATA_DIR / "agencies.json"
+    if not agencies_file.exists():
+        return set()
+
+    agencies_data = load_json(agencies_file)
+
+    titles = set()
+    for agency in agencies_data.get("agencies", []):
+        for node in [agency, *agency.get("children", [])]:
+            for cfr_ref in node.get("cfr_references", []):
+                if cfr_ref.get("title"):
+                    titles.add(int(cfr_ref["title"]))
+    return titles
+
+
 def download_bulk_data(title_summary_data: Dict):
     """
     Download bulk data for test titles.
     """
     client = ECFRApiClient()
 
+    # Titles no agency references are never analyzed, so don't download them
+    referenced_titles = get_referenced_titles()
+
     for item in title_summary_data["titles"]:
         title = item["number"]
         date = item["latest_issue_date"]
+
+        if item.get("reserved") or (
+            referenced_titles and title not in referenced_titles
+        ):
+            logger.info(f"Skipping title {title}: not referenced by any agency")
+            continue
         # Download title summary data
         try:
             logger.info("Downloading title structure data...")
             structure = client.get_structure(title, date)
             output_file = STRUCT_DIR / f"title_{title}_{date}_structure.json"
-            with open(output_file, "w") as f:
-                json.dump(structure, f, indent=2)
+            dump_json(output_file, structure)
             logger.info(f"Structure data saved to {output_file}")
         except Exception as e:
             logger.info(f"Error downloading structure for title {title}: {e}")
@@ -357,9 +419,7 @@ if __name__ == "__main__":
             download_admin_data()
         elif command == "download_bulk_data":
             download_bulk_data(
-                title_summary_data=json.load(
-                    open(ADMIN_DATA_DIR / "title_summary.json")
-                )
+                title_summary_data=load_json(ADMIN_DATA_DIR / "title_summary.json")
             )
         else:
             logger.info(f"Unknown command: {command}")
@@ -2,123 +2,499 @@
 Footprint analyzer for eCFR data, focusing on specific keyword patterns.
 """
 
+import functools
 import logging
 import re
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from collections import defaultdict, Counter
 
+import ahocorasick
+
+try:
+    import hyperscan
+except ImportError:  # Optional and x86-only; the automaton is used instead
+    hyperscan = None
+
 from ecfr_analyzer.process_data.base_analyzer import BaseECFRAnalyzer
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Keyword sets for different types of footprint analysis
-DEI_WORDS = {
-    "diversity",
-    "equity",
-    "inclusion",
-    "inclusive",
-    "equality",
-    "minority",
-    "minorities",
-    "underrepresented",
-    "underserved",
-    "disadvantaged",
-    "gender equity",
-    "marginalized",
-    "multicultural",
-    "race",
-    "racial",
-    "ethnic",
-    "ethnicity",
-    "discrimination",
-    "harassment",
-    "accessibility",
-    "social justice",
-    "environment",
-    "sexual orientation",
-    "gender identity",
-}
-
-BUREAUCRACY_WORDS = {
-    "compliance",
-    "procedure",
-    "procedures",
-    "process",
-    "processes",
-    "requirement",
-    "requirements",
-    "regulation",
-    "regulations",
-    "regulatory",
-    "mandate",
-    "mandates",
-    "mandated",
-    "approval",
-    "approvals",
-    "paperwork",
-    "documentation",
-    "report",
-    "reporting",
-    "deadline",
-    "submit",
-    "request",
-    "certify",
-    "filing",
-    "authorization",
-    "form",
-}
+# Keyword sets for different types of footprint analysis, as frozensets of
+# interned strings
+DEI_WORDS = frozenset(
+    sys.intern(word)
+    for word in {
+        "diversity",
+        "equity",
+        "inclusion",
+        "inclusive",
+        "equality",
+        "minority",
+        "minorities",
+        "underrepresented",
+        "underserved",
+        "disadvantaged",
+        "gender equity",
+        "marginalized",
+        "multicultural",
+        "race",
+        "racial",
+        "ethnic",
+        "ethnicity",
+        "discrimination",
+        "harassment",
+        "accessibility",
+        "social justice",
+        "environment",
+        "sexual orientation",
+        "gender identity",
+    }
+)
+
+BUREAUCRACY_WORDS = frozenset(
+    sys.intern(word)
+    for word in {
+        "compliance",
+        "procedure",
+        "procedures",
+        "process",
+        "processes",
+        "requirement",
+        "requirements",
+        "regulation",
+        "regulations",
+        "regulatory",
+        "mandate",
+        "mandates",
+        "mandated",
+        "approval",
+        "approvals",
+        "paperwork",
+        "documentation",
+        "report",
+        "reporting",
+        "deadline",
+        "submit",
+        "request",
+        "certify",
+        "filing",
+        "authorization",
+        "form",
+    }
+)
+
+# Built-in keyword sets, matched together in a single pass over each text.
+# No keyword of one set occurs inside a phrase of another, so the combined
+# scan finds the same matches as scanning for each set separately.
+BUILTIN_KEYWORD_SETS = [DEI_WORDS, BUREAUCRACY_WORDS]
+
+# Texts longer than this are split into pieces of about this many characters,
+# so one very long reference (e.g. a whole title) is scanned by several
+# workers instead of holding up the pool
+SCAN_CHUNK_CHARS = 1_000_000
+
+# Non-word characters long texts may be split after. No match can span a
+# separator that no keyword contains, and a piece edge is a word boundary
+# just like the separator, so the pieces' counts add up to the text's.
+SCAN_SEPARATORS = (".", "\n", ";", ")")
+
+
+# Keyword set matched by worker processes, set up by _init_keyword_worker
+_worker_keywords = None
+
+
+def _is_word_char(char):
+    """Check whether a character is a word character, as for a regex word boundary."""
+    return char.isalnum() or char == "_"
+
+
+def _resolve_keyword_matches(longest_at, words, word_lengths):
+    """Count whole-word matches, keeping the leftmost non-overlapping ones.
+
+    Matches are counted by keyword ID in a list, and only the matched
+    keywords are turned back into words at the end.
+
+    Args:
+        longest_at: Dictionary mapping each start offset to the ID of the
+            longest whole-word keyword starting there
+        words: Keywords by ID
+        word_lengths: Keyword lengths in offset units, by ID
+
+    Returns:
+        Counter with counts for each matched word
+    """
+    counts = [0] * len(words)
+    next_start = 0
+    for start in sorted(longest_at):
+        if start >= next_start:
+            word_id = longest_at[start]
+            counts[word_id] += 1
+            next_start = start + word_lengths[word_id]
+
+    return Counter(
+        {words[word_id]: count for word_id, count in enumerate(counts) if count}
+    )
+
+
+def _count_automaton_matches(text, automaton):
+    """Count whole-word keyword matches in text with an Aho-Corasick automaton.
+
+    Matches are counted like a word-bounded regex alternation of the keywords,
+    longest first: scanning left to right, the longest keyword with word
+    boundaries on both sides wins at each position and matches never overlap.
+
+    Args:
+        text: Lowercased text to search in, as extracted for references
+        automaton: Tuple of (automaton, words, word lengths) built by
+            _build_keyword_automaton
+
+    Returns:
+        Counter with counts for each matched word
+    """
+    automaton, words, word_lengths = automaton
+    if automaton.kind == ahocorasick.EMPTY:
+        return Counter()
+
+    text_len = len(text)
+
+    # ID of the longest whole-word keyword starting at each position
+    longest_at = {}
+    for end, word_id in automaton.iter(text):
+        word_length = word_lengths[word_id]
+        start = end - word_length + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end + 1 < text_len and _is_word_char(text[end + 1]):
+            continue
+        longest_id = longest_at.get(start)
+        if longest_id is None or word_length > word_lengths[longest_id]:
+            longest_at[start] = word_id
+
+    return _resolve_keyword_matches(longest_at, words, word_lengths)
+
+
+def _count_database_matches(text, database):
+    """Count whole-word keyword matches in text with a Hyperscan database.
+
+    Counted the same way as _count_automaton_matches. The database only
+    knows ASCII word boundaries, so a match next to a non-ASCII character is
+    checked again against the Unicode word characters a regex would use.
+
+    Args:
+        text: Lowercased text to search in, as extracted for references
+        database: Tuple of (database, words, word byte lengths) built by
+            _build_keyword_database
+
+    Returns:
+        Counter with counts for each matched word
+    """
+    db, words, word_lengths = database
+    data = text.encode("utf-8")
+    data_len = len(data)
+
+    # ID of the longest whole-word keyword starting at each byte offset
+    longest_at = {}
+
+    def on_match(word_id, start, end, flags, context):
+        if start > 0 and data[start - 1] >= 0x80:
+            char_start = start - 1
+            while data[char_start] & 0xC0 == 0x80:
+                char_start -= 1
+            if _is_word_char(data[char_start:start].decode("utf-8")):
+                return
+        if end < data_len and data[end] >= 0x80:
+            char_end = end + 1
+            while char_end < data_len and data[char_end] & 0xC0 == 0x80:
+                char_end += 1
+            if _is_word_char(data[end:char_end].decode("utf-8")):
+                return
+        longest_id = longest_at.get(start)
+        if longest_id is None or word_lengths[word_id] > word_lengths[longest_id]:
+            longest_at[start] = word_id
+
+    db.scan(data, match_event_handler=on_match)
+
+    return _resolve_keyword_matches(longest_at, words, word_lengths)
+
+
+def _count_keyword_set_matches(text, keywords):
+    """Count whole-word keyword matches with the fastest available matcher.
+
+    Hyperscan is used when installed, otherwise an Aho-Corasick automaton.
+    Both count the same matches.
+
+    Args:
+        text: Lowercased text to search in, as extracted for references
+        keywords: Keyword set from _normalize_keywords
+
+    Returns:
+        Counter with counts for each matched word
+    """
+    if not text or not keywords:
+        return Counter()
+
+    if hyperscan is not None:
+        return _count_database_matches(text, _build_keyword_database(keywords))
+    return _count_automaton_matches(text, _build_keyword_automaton(keywords))
+
+
+def _init_keyword_worker(keywords):
+    """Set up the keyword set once in each worker process."""
+    global _worker_keywords
+    _worker_keywords = keywords
+
+
+def _count_worker_matches(text):
+    """Count keyword matches in a worker process."""
+    return _count_keyword_set_matches(text, _worker_keywords)
+
+
+def _split_scan_text(text, separator):
+    """Split a long text into pieces of about SCAN_CHUNK_CHARS for scanning.
+
+    Each piece but the last ends with the separator.
+
+    Args:
+        text: Lowercased text to split
+        separator: Separator from SCAN_SEPARATORS that no keyword contains
+
+    Returns:
+        List of pieces, concatenating back to the text
+    """
+    pieces = []
+    start = 0
+    while len(text) - start > SCAN_CHUNK_CHARS:
+        cut = text.find(separator, start + SCAN_CHUNK_CHARS)
+        if cut == -1:
+            break
+        pieces.append(text[start : cut + 1])
+        start = cut + 1
+    pieces.append(text[start:])
+    return pieces
+
+
+def _normalize_keywords(keywords):
+    """Lowercase and intern keywords for matching.
+
+    Matched words are interned, so checking them against the keyword sets
+    hits the identity fast path.
+
+    Args:
+        keywords: Set of keywords to match
+
+    Returns:
+        Frozenset of the distinct, non-empty lowercased keywords
+    """
+    return frozenset(sys.intern(word.lower()) for word in keywords if word)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_keyword_automaton(keywords):
+    """Build an Aho-Corasick automaton for efficient matching of keywords.
+
+    A single pass over a text finds every keyword, without the per-position
+    alternation of a regex. Cached, so each keyword set is built once per
+    process.
+
+    Args:
+        keywords: Keyword set from _normalize_keywords
+
+    Returns:
+        Tuple of (automaton reporting keyword IDs, words by ID, word lengths
+        by ID)
+    """
+    words = tuple(sorted(keywords))
+    automaton = ahocorasick.Automaton()
+    for word_id, word in enumerate(words):
+        automaton.add_word(word, word_id)
+    automaton.make_automaton()
+    return automaton, words, tuple(len(word) for word in words)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_keyword_database(keywords):
+    """Compile a Hyperscan database for efficient matching of keywords.
+
+    Hyperscan scans all keywords at once with SIMD, several times faster
+    than the automaton. Cached, so each keyword set is compiled once per
+    process.
+
+    Args:
+        keywords: Keyword set from _normalize_keywords
+
+    Returns:
+        Tuple of (database, words by pattern ID, word byte lengths by ID)
+    """
+    words = tuple(sorted(keywords))
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[
+            rb"\b" + re.escape(word).encode("utf-8") + rb"\b" for word in words
+        ],
+        ids=list(range(len(words))),
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(words),
+    )
+    word_lengths = tuple(len(word.encode("utf-8")) for word in words)
+    return db, words, word_lengths
+
+
+# Combined keyword set for the built-in footprints
+BUILTIN_KEYWORDS = _normalize_keywords(frozenset().union(*BUILTIN_KEYWORD_SETS))
 
 
 class FootprintAnalyzer(BaseECFRAnalyzer):
     """Analyzer for keyword footprints in eCFR text by agency."""
 
-    def __init__(self):
-        """Initialize the footprint analyzer."""
-        super().__init__()
+    def __init__(self, agencies_data=None):
+        """Initialize the footprint analyzer.
+
+        Args:
+            agencies_data: Optional agencies data already loaded by the caller
+        """
+        super().__init__(agencies_data)
         self.word_count_analyzer = None
         self.footprint_results = {}
 
-    def _compile_regex_pattern(self, keywords):
-        """Compile a regex pattern for efficient matching of keywords.
+        # Combined keyword set for the built-in footprints, with its matches
+        # cached by reference text so each text is scanned only once
+        self.builtin_keywords = BUILTIN_KEYWORDS
+        self.text_keyword_matches = {}
+
+    def _count_keyword_matches(self, text, keywords):
+        """Count matches for each keyword in the text.
 
         Args:
-            keywords: Set of keywords to match
+            text: Lowercased text to search in
+            keywords: Keyword set from _normalize_keywords
 
         Returns:
-            Compiled regex pattern
+            Counter with counts for each matched word
         """
-        # Escape special regex characters and join with OR
-        pattern = "|".join(re.escape(word) for word in keywords)
-        # Case insensitive matching with word boundaries
-        return re.compile(r"\b(" + pattern + r")\b", re.IGNORECASE)
+        # Find all matches
+        return _count_keyword_set_matches(text, keywords)
 
-    def _count_keyword_matches(self, text, pattern):
-        """Count matches for each keyword in the text.
+    def _count_builtin_keyword_matches(self, text, keywords):
+        """Count matches for one built-in keyword set using the combined scan.
+
+        Args:
+            text: Text to search in
+            keywords: One of BUILTIN_KEYWORD_SETS
+
+        Returns:
+            Counter with counts for each matched word of the set
+        """
+        match_counter = self._get_keyword_matches(
+            text, self.builtin_keywords, self.text_keyword_matches
+        )
+
+        return Counter(
+            {word: count for word, count in match_counter.items() if word in keywords}
+        )
+
+    def _get_keyword_matches(self, text, keywords, text_matches):
+        """Count keyword matches in a text, reusing an earlier scan if any.
 
         Args:
             text: Text to search in
-            pattern: Compiled regex pattern
+            keywords: Keyword set from _normalize_keywords
+            text_matches: Dictionary of match Counters by text for this keyword set
 
         Returns:
             Counter with counts for each matched word
         """
-        if not text:
-            return Counter()
+        match_counter = text_matches.get(text)
+        if match_counter is None:
+            match_counter = self._count_keyword_matches(text, keywords)
+            text_matches[text] = match_counter
+        return match_counter
 
-        # Find all matches
-        matches = pattern.findall(text.lower())
-        return Counter(matches)
+    def _scan_keywords(self, texts, keywords, text_matches):
+        """Count keyword matches for many texts, in worker processes if worthwhile.
+
+        Batches _use_process_pool rejects are scanned in-process, and so is
+        everything when Hyperscan is available, as it scans faster than texts
+        can be sent to workers.
+
+        Args:
+            texts: Distinct reference texts to scan
+            keywords: Keyword set from _normalize_keywords
+            text_matches: Dictionary of match Counters by text to fill
+        """
+        texts = [text for text in texts if text not in text_matches]
+        if not texts:
+            return
+
+        logger.info(f"Scanning {len(texts)} texts for keywords")
+
+        # A pool only pays off with several workers, enough text to scan and
+        # the slower automaton
+        if hyperscan is not None or not self._use_process_pool(texts):
+            for text in texts:
+                text_matches[text] = _count_keyword_set_matches(text, keywords)
+            return
+
+        # Split long texts after a separator no keyword contains, if any, and
+        # remember which text each piece belongs to
+        separator = next(
+            (
+                sep
+                for sep in SCAN_SEPARATORS
+                if not any(sep in word for word in keywords)
+            ),
+            None,
+        )
+        pieces = []
+        piece_texts = []
+        for text in texts:
+            if separator and len(text) > SCAN_CHUNK_CHARS:
+                text_pieces = _split_scan_text(text, separator)
+            else:
+                text_pieces = [text]
+            pieces.extend(text_pieces)
+            piece_texts.extend([text] * len(text_pieces))
+
+        chunksize = max(1, len(pieces) // (self.max_workers * 4))
+        # The keywords are sent to each worker once rather than with every
+        # text, and each worker builds its matcher on first use
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_keyword_worker,
+            initargs=(keywords,),
+        ) as executor:
+            match_counters = executor.map(
+                _count_worker_matches, pieces, chunksize=chunksize
+            )
+            for text, match_counter in zip(piece_texts, match_counters):
+                if text in text_matches:
+                    text_matches[text].update(match_counter)
+                else:
+                    text_matches[text] = match_counter
+
+    def _scan_builtin_keywords(self, texts):
+        """Count built-in keyword matches for many texts across worker processes.
 
-    def _footprint_analysis_function(self, agency_slug, ref_text, ref_desc, pattern):
+        Fills text_keyword_matches, so each text is scanned once for every
+        built-in footprint.
+
+        Args:
+            texts: Distinct reference texts to scan
+        """
+        self._scan_keywords(texts, self.builtin_keywords, self.text_keyword_matches)
+
+    def _footprint_analysis_function(
+        self, agency_slug, ref_text, ref_desc, count_matches
+    ):
         """Analysis function for keyword footprint.
 
         Args:
             agency_slug: Agency slug
             ref_text: Extracted text for the reference
             ref_desc: Description of the reference
-            pattern: Compiled regex pattern for keywords
+            count_matches: Function returning a Counter of keyword matches in a text
 
         Returns:
             Dictionary with footprint information
@@ -127,18 +503,20 @@ class FootprintAnalyzer(BaseECFRAnalyzer):
             return None
 
         # Count keyword matches
-        match_counter = self._count_keyword_matches(ref_text, pattern)
+        match_counter = count_matches(ref_text)
         total_matches = sum(match_counter.values())
 
         if total_matches == 0:
             return None
 
-        # Get individual keyword matches
-        keyword_matches = {word: count for word, count in match_counter.items()}
+        # Get individual keyword matches, copied in one C-level dict call
+        keyword_matches = dict(match_counter)
 
-        logger.debug(
-            f"Agency {agency_slug} has {total_matches} keyword matches for {ref_desc}"
-        )
+        # Called for every agency reference, so skip formatting unless needed
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Agency {agency_slug} has {total_matches} keyword matches for {ref_desc}"
+            )
 
         return {
             "total_matches": total_matches,
@@ -148,49 +526,63 @@ class FootprintAnalyzer(BaseECFRAnalyzer):
 
     def analyze_keyword_footprint(self, keywords, footprint_name):
         """Analyze footprint of specific keywords by agency."""
-        # Compile regex pattern once for efficiency
-        pattern = self._compile_regex_pattern(keywords)
+        # Built-in sets share one combined scan; other keywords get their own
+        # matcher, built once for efficiency. Either way the distinct texts
+        # are scanned up front, across worker processes when worthwhile.
+        if any(keywords == keyword_set for keyword_set in BUILTIN_KEYWORD_SETS):
+            count_matches = functools.partial(
+                self._count_builtin_keyword_matches, keywords=keywords
+            )
+            prepare_texts = self._scan_builtin_keywords
+        else:
+            keyword_set = _normalize_keywords(keywords)
+            text_matches = {}
+            count_matches = functools.partial(
+                self._get_keyword_matches,
+                keywords=keyword_set,
+                text_matches=text_matches,
+            )
+            prepare_texts = functools.partial(
+                self._scan_keywords, keywords=keyword_set, text_matches=text_matches
+            )
 
         logger.info(f"Starting {footprint_name} footprint analysis...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Process agency references with footprint analysis function
         agency_ref_matches = self._process_agency_references(
             lambda agency_slug, ref_text, ref_desc: self._footprint_analysis_function(
-                agency_slug, ref_text, ref_desc, pattern
-            )
+                agency_slug, ref_text, ref_desc, count_matches
+            ),
+            prepare_texts=prepare_texts,
         )
 
-        # Calculate totals for each agency
-        agency_totals = defaultdict(int)
-        for agency_slug, ref_matches in agency_ref_matches.items():
-            agency_totals[agency_slug] = sum(
-                data["total_matches"] for data in ref_matches.values() if data
-            )
-
-        # Calculate the unique total (avoiding double-counting)
+        # Build the agency data structure for the roll-up function, with each
+        # agency's total and the unique per-title totals (avoiding
+        # double-counting shared references), in a single pass
+        agency_data = {}
         title_totals = defaultdict(int)
         counted_refs = set()
 
         for agency_slug, ref_matches in agency_ref_matches.items():
+            # Only include non-None data, keyed by the reference's string
+            # form, as it is saved
+            references = {}
+            agency_total = 0
             for ref_key, ref_data in ref_matches.items():
-                if ref_data and ref_key not in counted_refs:
+                if not ref_data:
+                    continue
+                references[str(ref_key)] = ref_data
+                agency_total += ref_data["total_matches"]
+                if ref_key not in counted_refs:
                     title_num = ref_key[0]  # Title is first element in the tuple
                     title_totals[title_num] += ref_data["total_matches"]
                     counted_refs.add(ref_key)
 
-        # Prepare the agency data structure for the roll-up function
-        agency_data = {
-            agency_slug: {
-                "total": agency_totals[agency_slug],
-                "references": {
-                    ref_key: ref_data
-                    for ref_key, ref_data in ref_matches.items()
-                    if ref_data  # Only include non-None data
-                },
+            agency_data[agency_slug] = {
+                "total": agency_total,
+                "references": references,
             }
-            for agency_slug, ref_matches in agency_ref_matches.items()
-        }
 
         # Roll up child agency data to parent agencies
         rolled_up_agency_data = self._roll_up_agency_totals(
@@ -207,7 +599,7 @@ class FootprintAnalyzer(BaseECFRAnalyzer):
             "agencies": rolled_up_agency_data,
         }
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(
             f"{footprint_name} footprint analysis took {total_time:.2f} seconds"
         )
@@ -0,0 +1,56 @@
+"""
+JSON file helpers shared by the eCFR API client and the analyzers.
+"""
+
+from pathlib import Path
+
+import orjson
+
+# orjson options for JSON files: non-string keys stringified and numpy values
+# converted
+JSON_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def load_json(path):
+    """Read and parse a JSON file with orjson.
+
+    Args:
+        path: Path of the JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    return orjson.loads(Path(path).read_bytes())
+
+
+def dump_json(path, data, indent=True):
+    """Write data to a JSON file with orjson.
+
+    Args:
+        path: Path of the JSON file to write
+        data: JSON-serializable data
+        indent: Whether to indent like json.dump(..., indent=2)
+    """
+    option = JSON_DUMP_OPTIONS | orjson.OPT_INDENT_2 if indent else JSON_DUMP_OPTIONS
+    Path(path).write_bytes(orjson.dumps(data, option=option))
+
+
+def write_json_if_changed(path: Path, data) -> bool:
+    """Write data as indented JSON unless the file already holds the same data.
+
+    Args:
+        path: Path of the JSON file to write
+        data: JSON-serializable data
+
+    Returns:
+        True if the file was written
+    """
+    if path.exists():
+        try:
+            if load_json(path) == data:
+                return False
+        except (OSError, ValueError):
+            pass
+
+    dump_json(path, data)
+    return True
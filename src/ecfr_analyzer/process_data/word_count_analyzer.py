@@ -4,129 +4,179 @@ Word count analyzer for eCFR data.
 
 import logging
 import re
-import nltk
+import string
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from ecfr_analyzer.process_data.base_analyzer import BaseECFRAnalyzer
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Download NLTK resources if not already available
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
-
-# Common stopwords for filtering
-STOPWORDS = {
-    "the",
-    "a",
-    "an",
-    "and",
-    "or",
-    "but",
-    "if",
-    "because",
-    "as",
-    "what",
-    "when",
-    "where",
-    "how",
-    "who",
-    "which",
-    "this",
-    "that",
-    "these",
-    "those",
-    "then",
-    "just",
-    "so",
-    "than",
-    "such",
-    "both",
-    "through",
-    "about",
-    "for",
-    "is",
-    "of",
-    "while",
-    "during",
-    "to",
-    "from",
-    "in",
-    "on",
-    "by",
-    "at",
-    "shall",
-    "must",
-    "may",
-    "should",
-    "would",
-    "could",
-    "can",
-    "are",
-    "be",
-    "with",
-    "not",
-    # Additional administrative stopwords
-    "federal",
-    "register",
-    "cfr",
-    "code",
-    "regulation",
-    "regulations",
-    "regulatory",
-    "agency",
-    "office",
-    "department",
-    "section",
-    "subsection",
-    "paragraph",
-    "gov",
-    "accessibility",
-}
+# Words are runs of letters in lowercased text
+TOKEN_PATTERN = re.compile(r"[a-z]+")
+
+# Byte translation table keeping lowercase ASCII letters and turning every
+# other byte into a space, so bytes.split() yields the same words
+TOKEN_BYTES_TABLE = bytes(
+    byte if chr(byte) in string.ascii_lowercase else ord(" ") for byte in range(256)
+)
+
+# Common stopwords for filtering, as a frozenset of interned strings
+STOPWORDS = frozenset(
+    sys.intern(word)
+    for word in {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "if",
+        "because",
+        "as",
+        "what",
+        "when",
+        "where",
+        "how",
+        "who",
+        "which",
+        "this",
+        "that",
+        "these",
+        "those",
+        "then",
+        "just",
+        "so",
+        "than",
+        "such",
+        "both",
+        "through",
+        "about",
+        "for",
+        "is",
+        "of",
+        "while",
+        "during",
+        "to",
+        "from",
+        "in",
+        "on",
+        "by",
+        "at",
+        "shall",
+        "must",
+        "may",
+        "should",
+        "would",
+        "could",
+        "can",
+        "are",
+        "be",
+        "with",
+        "not",
+        # Additional administrative stopwords
+        "federal",
+        "register",
+        "cfr",
+        "code",
+        "regulation",
+        "regulations",
+        "regulatory",
+        "agency",
+        "office",
+        "department",
+        "section",
+        "subsection",
+        "paragraph",
+        "gov",
+        "accessibility",
+    }
+)
+
+# Texts shorter than this (e.g. "[Reserved]" stubs) are counted directly
+# with TOKEN_PATTERN, which is cheaper than setting up the byte-level scan
+SHORT_TEXT_CHARS = 64
+
+# Stopwords as ASCII bytes for the byte-level token scan, encoded once at import
+STOPWORD_BYTES = frozenset(word.encode("ascii") for word in STOPWORDS)
+
+
+def _count_text_tokens(text):
+    """Count the non-stopword alphabetic tokens in a text.
+
+    The scan runs on bytes: non-ASCII characters become "?" and every
+    non-letter byte becomes a separator, so splitting and counting happen
+    in C rather than once per token in Python. Module-level so it can run
+    in worker processes.
+
+    Args:
+        text: Lowercased text to count words in, as extracted for references
+
+    Returns:
+        Number of non-stopword alphabetic tokens
+    """
+    if len(text) < SHORT_TEXT_CHARS:
+        return sum(1 for token in TOKEN_PATTERN.findall(text) if token not in STOPWORDS)
+
+    data = text.encode("ascii", "replace").translate(TOKEN_BYTES_TABLE)
+    token_counts = Counter(data.split())
+    stopword_count = sum(
+        token_counts[word] for word in STOPWORD_BYTES.intersection(token_counts)
+    )
+    return sum(token_counts.values()) - stopword_count
 
 
 class WordCountAnalyzer(BaseECFRAnalyzer):
     """Analyzer for counting words in eCFR text by agency."""
 
-    def __init__(self):
-        """Initialize the word count analyzer."""
-        super().__init__()
+    def __init__(self, agencies_data=None):
+        """Initialize the word count analyzer.
+
+        Args:
+            agencies_data: Optional agencies data already loaded by the caller
+        """
+        super().__init__(agencies_data)
         self.stopwords = STOPWORDS
         self.word_count_data = None
+        # Word counts by extracted reference text, so references shared by
+        # several agencies are only tokenized once
+        self.text_word_counts = {}
 
-    def _tokenize_text(self, text):
-        """Tokenize text into words, filtering out stopwords and non-alphabetic tokens.
+    def _count_texts(self, texts):
+        """Count words for many texts, across worker processes when worthwhile.
 
-        Args:
-            text: Text to tokenize
+        Fills text_word_counts for the texts the analysis function would
+        memoize, so each is tokenized once. Batches _use_process_pool rejects
+        are counted in-process.
 
-        Returns:
-            List of words
+        Args:
+            texts: Distinct reference texts to count
         """
-        try:
-            # Tokenize and filter
-            tokens = nltk.word_tokenize(text.lower())
-            # Keep only alphabetic tokens and remove stopwords
-            filtered_tokens = [
-                token
-                for token in tokens
-                if token.isalpha() and token not in self.stopwords
-            ]
-            return filtered_tokens
-        except Exception as e:
-            logger.warning(
-                f"NLTK tokenization failed: {e}, falling back to simple tokenization"
-            )
-            # Fall back to simpler tokenization
-            text = re.sub(r"[^\w\s]", " ", text.lower())
-            return [
-                word for word in text.split() if word and word not in self.stopwords
-            ]
+        texts = [
+            text
+            for text in texts
+            if len(text) >= SHORT_TEXT_CHARS and text not in self.text_word_counts
+        ]
+        if not texts:
+            return
+
+        logger.info(f"Counting words in {len(texts)} texts")
+
+        # A pool only pays off with several workers and enough text to count
+        if not self._use_process_pool(texts):
+            for text in texts:
+                self.text_word_counts[text] = _count_text_tokens(text)
+            return
+
+        chunksize = max(1, len(texts) // (self.max_workers * 4))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            word_counts = executor.map(_count_text_tokens, texts, chunksize=chunksize)
+            for text, word_count in zip(texts, word_counts):
+                self.text_word_counts[text] = word_count
 
     def _word_count_analysis_function(self, agency_slug, ref_text, ref_desc):
         """Analysis function for word counting.
@@ -142,11 +192,20 @@ class WordCountAnalyzer(BaseECFRAnalyzer):
         if not ref_text:
             return None
 
-        # Count words
-        tokens = self._tokenize_text(ref_text)
-        word_count = len(tokens)
+        # Count words once per distinct text; the cached text objects are shared
+        # across agencies, so the string hash is only computed on first use.
+        # Short texts are cheaper to count again than to keep in the memo.
+        if len(ref_text) < SHORT_TEXT_CHARS:
+            word_count = _count_text_tokens(ref_text)
+        else:
+            word_count = self.text_word_counts.get(ref_text)
+            if word_count is None:
+                word_count = _count_text_tokens(ref_text)
+                self.text_word_counts[ref_text] = word_count
 
-        logger.debug(f"Agency {agency_slug} has {word_count} words for {ref_desc}")
+        # Called for every agency reference, so skip formatting unless needed
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Agency {agency_slug} has {word_count} words for {ref_desc}")
 
         return {
             "count": word_count,
@@ -160,46 +219,40 @@ class WordCountAnalyzer(BaseECFRAnalyzer):
             Dictionary with word count data by agency
         """
         logger.info("Starting word count analysis by agency...")
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Process agency references with word count analysis
         agency_ref_counts = self._process_agency_references(
-            self._word_count_analysis_function
+            self._word_count_analysis_function, prepare_texts=self._count_texts
         )
 
-        # Calculate totals for each agency
-        agency_totals = defaultdict(int)
-        for agency_slug, ref_counts in agency_ref_counts.items():
-            agency_totals[agency_slug] = sum(
-                data["count"] for data in ref_counts.values()
-            )
-
-        # Calculate the unique total (avoiding double-counting)
+        # Build each agency's total, the unique per-title totals (counting
+        # each reference once) and the agency data structure for the roll-up
+        # function in a single pass
+        agency_data = {}
         title_totals = defaultdict(int)
-        # Track which references we've counted for the global total
         counted_refs = set()
 
         for agency_slug, ref_counts in agency_ref_counts.items():
+            agency_total = 0
             for ref_key, ref_data in ref_counts.items():
-                # Only count each reference once for the global total
+                count = ref_data["count"]
+                agency_total += count
                 if ref_key not in counted_refs:
                     title_num = ref_key[0]  # Title is first element in the tuple
-                    title_totals[title_num] += ref_data["count"]
+                    title_totals[title_num] += count
                     counted_refs.add(ref_key)
 
-        # Calculate the total word count across all agencies
-        total_word_count = sum(title_totals.values())
-
-        # Prepare the agency data structure for the roll-up function
-        agency_data = {
-            agency_slug: {
-                "total": agency_totals[agency_slug],
+            # References are keyed by their string form, as they are saved
+            agency_data[agency_slug] = {
+                "total": agency_total,
                 "references": {
-                    ref_key: ref_data for ref_key, ref_data in ref_counts.items()
+                    str(ref_key): ref_data for ref_key, ref_data in ref_counts.items()
                 },
             }
-            for agency_slug, ref_counts in agency_ref_counts.items()
-        }
+
+        # Calculate the total word count across all agencies
+        total_word_count = sum(title_totals.values())
 
         # Roll up child agency data to parent agencies
         rolled_up_agency_data = self._roll_up_agency_totals(
@@ -214,7 +267,7 @@ class WordCountAnalyzer(BaseECFRAnalyzer):
             "agencies": rolled_up_agency_data,
         }
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"Total word count analysis took {total_time:.2f} seconds")
         logger.info(f"Total word count across all agencies: {total_word_count}")
 